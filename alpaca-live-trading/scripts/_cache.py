@@ -0,0 +1,70 @@
+"""
+共享磁盘缓存模块
+
+按 URL + 排序后参数的 sha256 作键，在 TTL 内命中则完全跳过网络请求，
+既省延迟也省 API 配额（AlphaVantage 免费版 25 次/天）。
+
+用法:
+    from _cache import cached_get
+    data = cached_get(session, BASE_URL, params, ttl=300)
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+CACHE_DIR = Path.home() / ".cache" / "alpaca-skills"
+
+
+def _key_path(url: str, params: Dict[str, Any]) -> Path:
+    key = hashlib.sha256((url + urlencode(sorted(params.items()))).encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def cache_get(url: str, params: Dict[str, Any], ttl: float) -> Optional[Any]:
+    """TTL 内命中返回缓存的 JSON 数据，未命中/过期/损坏返回 None。"""
+    path = _key_path(url, params)
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cache_set(url: str, params: Dict[str, Any], data: Any) -> None:
+    """原子写入缓存（tmp + os.replace）；只读环境静默跳过。"""
+    path = _key_path(url, params)
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def cached_get(session, url: str, params: Dict[str, Any], ttl: float, timeout: int = 30) -> Any:
+    """
+    带 TTL 磁盘缓存的 GET：命中返回缓存，未命中请求并写缓存。
+
+    仅缓存成功（2xx）响应的 JSON body；需要自定义错误分类/重试的调用方
+    可直接组合 cache_get / cache_set。
+    """
+    cached = cache_get(url, params, ttl)
+    if cached is not None:
+        return cached
+    response = session.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    cache_set(url, params, data)
+    return data
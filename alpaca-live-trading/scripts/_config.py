@@ -10,7 +10,10 @@
     api_key = config["alphavantage"]["api_key"]
 """
 
+import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -18,8 +21,12 @@ try:
     import yaml
 except ImportError:
     print("❌ 缺少 pyyaml 依赖，请安装: pip install pyyaml")
+    print("   （建议安装带 libyaml 的版本，YAML 解析可提速约 10 倍）")
     sys.exit(1)
 
+# 优先使用 libyaml 的 C 实现（语义与 SafeLoader 完全一致，仅解析更快）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Skill 根目录: skills/alpaca-live-trading/
 SKILL_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_FILE = SKILL_ROOT / "config.yaml"
@@ -38,9 +45,70 @@ DEFAULT_RISK_CONFIG: Dict[str, Any] = {
 }
 
 
+def _cache_path_for(config_path: Path) -> Path:
+    # config.yaml -> .config.yaml.cache.json（同目录，随 YAML mtime 失效）
+    return config_path.parent / f".{config_path.name}.cache.json"
+
+
+def _read_config_cache(config_path: Path) -> Dict[str, Any]:
+    """若 JSON 缓存不旧于 YAML 则直接读取，JSON 解析比 YAML 快一个数量级。"""
+    cache_path = _cache_path_for(config_path)
+    try:
+        if cache_path.stat().st_mtime >= config_path.stat().st_mtime:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if isinstance(cached, dict):
+                return cached
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_config_cache(config_path: Path, config: Dict[str, Any]) -> None:
+    """原子写入缓存（tmp + os.replace）；只读安装时静默跳过。"""
+    cache_path = _cache_path_for(config_path)
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        # 缓存含明文 API Key，与 config.yaml 同等敏感：0o600 仅属主可读
+        fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(path_str: str) -> Dict[str, Any]:
+    config_path = Path(path_str)
+
+    if not config_path.exists():
+        print(f"❌ 配置文件不存在: {config_path}")
+        print(f"   请复制模板并填入真实 API Key:")
+        print(f"   cp {CONFIG_EXAMPLE_FILE} {CONFIG_FILE}")
+        sys.exit(1)
+
+    cached = _read_config_cache(config_path)
+    if cached is not None:
+        return cached
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=_YAML_LOADER)
+
+    if not isinstance(config, dict):
+        print(f"❌ 配置文件格式错误: {config_path}")
+        sys.exit(1)
+
+    _write_config_cache(config_path, config)
+    return config
+
+
 def load_config(config_path: Path = None) -> Dict[str, Any]:
     """
-    加载 config.yaml 配置文件
+    加载 config.yaml 配置文件（同一进程内按路径记忆化，重复调用免 IO）
 
     Args:
         config_path: 配置文件路径，默认为 skills/alpaca-live-trading/config.yaml
@@ -54,21 +122,11 @@ def load_config(config_path: Path = None) -> Dict[str, Any]:
     """
     if config_path is None:
         config_path = CONFIG_FILE
+    return _load_config_cached(str(config_path))
 
-    if not config_path.exists():
-        print(f"❌ 配置文件不存在: {config_path}")
-        print(f"   请复制模板并填入真实 API Key:")
-        print(f"   cp {CONFIG_EXAMPLE_FILE} {CONFIG_FILE}")
-        sys.exit(1)
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-
-    if not isinstance(config, dict):
-        print(f"❌ 配置文件格式错误: {config_path}")
-        sys.exit(1)
-
-    return config
+# 测试用：清空进程内记忆化缓存
+load_config.cache_clear = _load_config_cached.cache_clear
 
 
 def get_alphavantage_key(config: Dict[str, Any] = None) -> str:
@@ -82,18 +140,28 @@ def get_alphavantage_key(config: Dict[str, Any] = None) -> str:
     return key
 
 
+@lru_cache(maxsize=1)
+def _validated_alpaca_creds() -> tuple:
+    """默认配置下的凭证校验只做一次，批量交易时热路径免去重复字符串检查。"""
+    return _extract_alpaca_credentials(load_config())
+
+
 def get_alpaca_credentials(config: Dict[str, Any] = None) -> tuple:
     """
     获取 Alpaca API 凭证
 
     Args:
-        config: 配置字典，为空则自动加载
+        config: 配置字典，为空则自动加载（结果带进程内缓存）
 
     Returns:
         (api_key, secret_key, paper) 元组，paper 为 bool 表示是否模拟交易
     """
     if config is None:
-        config = load_config()
+        return _validated_alpaca_creds()
+    return _extract_alpaca_credentials(config)
+
+
+def _extract_alpaca_credentials(config: Dict[str, Any]) -> tuple:
     alpaca_config = config.get("alpaca", {})
     api_key = alpaca_config.get("api_key", "")
     secret_key = alpaca_config.get("secret_key", "")
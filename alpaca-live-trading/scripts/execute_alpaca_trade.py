@@ -17,7 +17,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -37,6 +39,27 @@ try:
 except ImportError:
     ZoneInfo = None
 
+# tz 对象解析一次并缓存，避免每笔交易的 tzdata 文件系统查找；
+# 极端情况下 zoneinfo 不可用则保留 UTC，避免脚本失败
+_ET_TZ = ZoneInfo("US/Eastern") if ZoneInfo is not None else timezone.utc
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        """orjson 在 C 层直接序列化为 bytes，比 stdlib json 快 3-5 倍。"""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
 
 DEFAULT_POSITION_SYMBOLS = [
     "NVDA", "MSFT", "AAPL", "GOOG", "GOOGL", "AMZN", "META", "AVGO", "TSLA", "NFLX",
@@ -52,6 +75,13 @@ DEFAULT_POSITION_SYMBOLS = [
     "QQQ",
 ]
 
+# 模板只构建一次，每笔交易用 C 级 dict.copy() 代替 101 次逐项插入
+_POSITION_TEMPLATE = {symbol: 0 for symbol in DEFAULT_POSITION_SYMBOLS}
+_POSITION_SYMBOLS = frozenset(DEFAULT_POSITION_SYMBOLS)
+_SYMBOL_INDEX = {symbol: i for i, symbol in enumerate(DEFAULT_POSITION_SYMBOLS)}
+# 符号宇宙达到该规模时（如 Russell 3000）改走 numpy 连续缓冲归一化
+_NP_NORMALIZE_THRESHOLD = 1024
+
 TERMINAL_ORDER_STATUSES = {
     "filled",
     "partially_filled",
@@ -67,6 +97,12 @@ def resolve_skill_data_dir() -> Path:
     return Path(__file__).resolve().parent.parent / "data"
 
 
+def _enum_str(value: Any) -> str:
+    """枚举取 .value、其他取 str()。getattr 带默认值避免 hasattr 的异常开销。"""
+    s = getattr(value, "value", None)
+    return s if isinstance(s, str) else str(value)
+
+
 def get_dual_timestamps(order) -> Dict[str, str]:
     """
     生成双时区时间戳，避免跨机器时区漂移。
@@ -78,21 +114,41 @@ def get_dual_timestamps(order) -> Dict[str, str]:
     elif dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
 
-    if ZoneInfo is not None:
-        et_dt = dt.astimezone(ZoneInfo("US/Eastern"))
-    else:
-        # fallback: 若极端情况下不可用 zoneinfo，则保留 UTC，避免脚本失败
-        et_dt = dt.astimezone(timezone.utc)
+    et_iso = dt.astimezone(_ET_TZ).isoformat(timespec="seconds")
 
     return {
-        "date": et_dt.strftime("%Y-%m-%d %H:%M:%S"),
-        "timestamp_et": et_dt.isoformat(timespec="seconds"),
+        # isoformat 已含日期和时间，切片拼接即可，省去一次 strftime 格式解析
+        "date": et_iso[:10] + " " + et_iso[11:19],
+        "timestamp_et": et_iso,
         "timestamp_utc": dt.astimezone(timezone.utc).isoformat(timespec="seconds"),
     }
 
 
+def _normalize_positions_np(raw_positions: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    numpy SoA 归一化：qty 写入预分配的 int64 连续缓冲（索引映射建一次），
+    末尾 zip 回 dict。大符号宇宙下避免逐键 dict 写入的解释器开销。
+    """
+    qty = np.zeros(len(DEFAULT_POSITION_SYMBOLS), dtype=np.int64)
+    extras: Dict[str, int] = {}
+    for symbol, value in raw_positions.items():
+        if symbol == "CASH":
+            continue
+        idx = _SYMBOL_INDEX.get(symbol)
+        if idx is None:
+            extras[symbol] = int(float(value))
+        else:
+            qty[idx] = int(float(value))
+    out = dict(zip(DEFAULT_POSITION_SYMBOLS, qty.tolist()))
+    out.update(extras)
+    out["CASH"] = float(raw_positions.get("CASH", 0.0))
+    return out
+
+
 def normalize_positions(raw_positions: Dict[str, Any]) -> Dict[str, Any]:
-    out = {symbol: 0 for symbol in DEFAULT_POSITION_SYMBOLS}
+    if np is not None and len(DEFAULT_POSITION_SYMBOLS) >= _NP_NORMALIZE_THRESHOLD:
+        return _normalize_positions_np(raw_positions)
+    out = _POSITION_TEMPLATE.copy()
     for symbol, qty in raw_positions.items():
         if symbol == "CASH":
             continue
@@ -101,9 +157,8 @@ def normalize_positions(raw_positions: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 
-def get_next_id(jsonl_path: Path) -> int:
-    if not jsonl_path.exists():
-        return 0
+def _scan_max_id(jsonl_path: Path) -> int:
+    """全文件扫描取最大 id（兜底路径，尾行损坏时使用）。"""
     current = 0
     with open(jsonl_path, "r", encoding="utf-8") as f:
         for line in f:
@@ -118,41 +173,150 @@ def get_next_id(jsonl_path: Path) -> int:
     return current
 
 
-def append_jsonl(jsonl_path: Path, row: Dict[str, Any]) -> None:
-    jsonl_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(jsonl_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+def _read_last_line(f) -> bytes:
+    """从文件末尾按 4 KiB 块向前读，返回最后一个非空行（二进制）。"""
+    block = 4096
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    buf = b""
+    offset = size
+    while offset > 0:
+        step = min(block, offset)
+        offset -= step
+        f.seek(offset)
+        buf = f.read(step) + buf
+        lines = buf.rstrip(b"\n").splitlines()
+        if len(lines) > 1 or offset == 0:
+            return lines[-1] if lines else b""
+    return b""
 
 
-def build_positions_from_alpaca(account, positions) -> Dict[str, Any]:
-    raw = {"CASH": float(account.cash)}
-    for pos in positions:
-        raw[pos.symbol] = int(float(pos.qty))
-    return normalize_positions(raw)
+def get_next_id(jsonl_path: Path) -> int:
+    # id 单调递增，只需解码最后一行即可，避免 O(N) 全量扫描
+    if not jsonl_path.exists():
+        return 0
+    try:
+        with open(jsonl_path, "rb") as f:
+            last_line = _read_last_line(f)
+        if not last_line:
+            return 0
+        return int(json.loads(last_line).get("id", 0))
+    except Exception:
+        # 最后一行可能写入一半损坏，退回全量扫描恢复
+        return _scan_max_id(jsonl_path)
+
+
+def _lastid_path(jsonl_path: Path) -> Path:
+    return jsonl_path.with_suffix(".lastid")
+
+
+def read_last_id(jsonl_path: Path) -> int:
+    """
+    读取当前最大 id。优先读 .lastid 计数器文件（免 JSON 解析），
+    不存在或损坏时退回 get_next_id 并重建计数器。
+    """
+    try:
+        return int(_lastid_path(jsonl_path).read_text(encoding="ascii").strip())
+    except (OSError, ValueError):
+        last_id = get_next_id(jsonl_path)
+        write_last_id(jsonl_path, last_id)
+        return last_id
+
+
+def write_last_id(jsonl_path: Path, last_id: int) -> None:
+    """原子更新 .lastid 计数器；失败不影响主流程（下次会重建）。"""
+    lastid_path = _lastid_path(jsonl_path)
+    tmp_path = lastid_path.with_suffix(".lastid.tmp")
+    try:
+        tmp_path.write_text(str(last_id), encoding="ascii")
+        os.replace(tmp_path, lastid_path)
+    except OSError:
+        pass
+
+
+# 已确认存在的目录，免去每次 append 的 stat/mkdir syscall
+_ENSURED_DIRS: set = set()
+
+
+def _ensure_parent_dir(jsonl_path: Path) -> None:
+    parent = jsonl_path.parent
+    if parent not in _ENSURED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(parent)
 
 
-def build_positions_details(positions) -> List[Dict[str, Any]]:
+def _encode_snapshot_row(row: Dict[str, Any]) -> bytes:
+    """
+    position/balance 行的专用编码器。两种行的顶层模式固定：
+    三个 ASCII 时间戳打头、若干嵌套对象随后。骨架直接拼接字符串，
+    只有变长的嵌套部分走通用 _dumps，绕过对固定键的逐键分派。
+    """
+    parts = [
+        '{"date":"%s","timestamp_et":"%s","timestamp_utc":"%s"'
+        % (row["date"], row["timestamp_et"], row["timestamp_utc"])
+    ]
+    for key, value in row.items():
+        if key in ("date", "timestamp_et", "timestamp_utc"):
+            continue
+        if isinstance(value, int):
+            parts.append(',"%s":%d' % (key, value))
+        else:
+            parts.append(',"%s":' % key)
+            parts.append(_dumps(value).rstrip(b"\n").decode("utf-8"))
+    parts.append("}\n")
+    return "".join(parts).encode("utf-8")
+
+
+def append_jsonl(jsonl_path: Path, rows: Any, fsync: bool = True, encoder=_dumps) -> None:
+    """
+    追加一行或多行 JSONL。多行会预编码为 bytes 后一次 write + 一次 fsync，
+    避免逐行 open/close 带来的 syscall 开销。encoder 可换成专用编码器。
+    """
+    if isinstance(rows, dict):
+        rows = [rows]
+    payload = b"".join(encoder(row) for row in rows)
+    _ensure_parent_dir(jsonl_path)
+    # O_APPEND 下的单次 write 由内核保证追加原子性（并发写者安全），
+    # 且比 "a" 模式省去 TextIOWrapper 缓冲层与显式 seek-to-end
+    fd = os.open(str(jsonl_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, payload)
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def build_snapshot(account, positions) -> tuple:
+    """
+    单次遍历 positions 同时产出 (normalized_positions, positions_details)，
+    每个属性只取一次、每个数值只做一次 str->float 转换。
+    """
+    raw = {"CASH": float(account.cash)}
     details = []
     for pos in positions:
+        sym = pos.symbol
+        qty_f = float(pos.qty)
+        avg_entry = float(pos.avg_entry_price)
+        raw[sym] = int(qty_f)
         details.append(
             {
-                "symbol": pos.symbol,
-                "qty": float(pos.qty),
-                "filled_price": float(pos.avg_entry_price),  # 当前持仓口径下的成交均价（成本）
-                "avg_entry_price": float(pos.avg_entry_price),
+                "symbol": sym,
+                "qty": qty_f,
+                "filled_price": avg_entry,  # 当前持仓口径下的成交均价（成本）
+                "avg_entry_price": avg_entry,
                 "current_price": float(pos.current_price),
                 "market_value": float(pos.market_value),
                 "unrealized_pl": float(pos.unrealized_pl),
                 "unrealized_plpc": float(pos.unrealized_plpc),
-                "side": pos.side.value if hasattr(pos.side, "value") else str(pos.side),
+                "side": _enum_str(pos.side),
             }
         )
-    return details
+    return normalize_positions(raw), details
 
 
 def order_status_value(order: Any) -> str:
-    status = getattr(order, "status", "")
-    return status.value if hasattr(status, "value") else str(status)
+    return _enum_str(getattr(order, "status", ""))
 
 
 def to_float_or_none(value: Any) -> Optional[float]:
@@ -164,118 +328,79 @@ def to_float_or_none(value: Any) -> Optional[float]:
         return None
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="执行/管理 Alpaca 交易并更新 position/balance")
-    parser.add_argument("--action", choices=["buy", "sell"], help="交易动作")
-    parser.add_argument("--symbol", help="股票代码，如 AAPL")
-    parser.add_argument("--qty", type=int, help="交易股数，正整数")
-    parser.add_argument("--order-type", choices=["market", "limit"], default="market", help="订单类型")
-    parser.add_argument("--limit-price", type=float, help="限价单价格（order-type=limit 时必填）")
-    parser.add_argument("--wait-seconds", type=int, default=15, help="提交后轮询订单状态秒数，默认 15")
-    parser.add_argument("--cancel-order-id", help="取消指定订单")
-    parser.add_argument("--cancel-all-open", action="store_true", help="取消所有未完成订单")
-    parser.add_argument("--json", action="store_true", help="输出 JSON")
-    args = parser.parse_args()
-
-    config = load_config()
-    api_key, secret_key, paper = get_alpaca_credentials(config)
-    client = TradingClient(api_key, secret_key, paper=paper)
-    # 订单管理操作
-    if args.cancel_order_id:
-        client.cancel_order_by_id(args.cancel_order_id)
-        result = {
-            "operation": "cancel_order",
-            "order_id": args.cancel_order_id,
-            "status": "requested",
-            "paper": bool(paper),
-        }
-        if args.json:
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-        else:
-            mode = "Paper Trading" if paper else "Live Trading"
-            print(f"✅ 已提交撤单请求 ({mode})")
-            print(f"  订单号: {args.cancel_order_id}")
-        raise SystemExit(0)
-
-    if args.cancel_all_open:
-        responses = client.cancel_orders()
-        out = []
-        for r in responses:
-            out.append(
-                {
-                    "id": str(getattr(r, "id", "")),
-                    "status_code": int(getattr(r, "status", 0))
-                    if getattr(r, "status", None) is not None
-                    else None,
-                }
-            )
-        result = {
-            "operation": "cancel_all_open",
-            "cancelled_count": len(out),
-            "responses": out,
-            "paper": bool(paper),
-        }
-        if args.json:
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-        else:
-            mode = "Paper Trading" if paper else "Live Trading"
-            print(f"✅ 已提交批量撤单 ({mode})")
-            print(f"  撤单数量: {len(out)}")
-        raise SystemExit(0)
-
-    # 交易提交参数校验
-    if not args.action:
-        print("❌ 缺少操作，请使用 --action 或撤单参数")
-        raise SystemExit(1)
-    if not args.symbol:
-        print("❌ --symbol 必填")
-        raise SystemExit(1)
-    if args.qty is None or args.qty <= 0:
-        print("❌ --qty 必须为正整数")
-        raise SystemExit(1)
-    if args.order_type == "limit" and (args.limit_price is None or args.limit_price <= 0):
-        print("❌ 限价单必须提供有效的 --limit-price")
-        raise SystemExit(1)
-    if args.order_type == "market" and args.limit_price is not None:
-        print("❌ 市价单不需要 --limit-price")
-        raise SystemExit(1)
-    if args.wait_seconds < 0:
-        print("❌ --wait-seconds 不能小于 0")
-        raise SystemExit(1)
-
-    symbol = args.symbol.upper()
-    side = OrderSide.BUY if args.action == "buy" else OrderSide.SELL
+def _tune_session_pool(client) -> None:
+    """
+    为 TradingClient 内部的 requests.Session 挂载更大的连接池，
+    让并发的 get_account/get_all_positions 与批量交易复用已握手的 socket。
+    依赖 alpaca-py 私有属性，失败时静默跳过（不影响功能，只损失复用）。
+    """
+    try:
+        from requests.adapters import HTTPAdapter
 
-    if args.order_type == "market":
+        session = getattr(client, "_session", None)
+        if session is not None and hasattr(session, "mount"):
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("https://", adapter)
+    except Exception:
+        pass
+
+
+def execute_trade(
+    client: Any,
+    paper: bool,
+    action: str,
+    symbol: str,
+    qty: int,
+    order_type: str = "market",
+    limit_price: Optional[float] = None,
+    wait_seconds: int = 15,
+) -> Dict[str, Any]:
+    """提交一笔订单、轮询状态并落盘 position/balance，返回结果字典。"""
+    symbol = symbol.upper()
+    side = OrderSide.BUY if action == "buy" else OrderSide.SELL
+
+    # 刻意走完整的 Pydantic 校验（不用 model_construct 模板）：
+    # symbol/qty 来自上游生成的交易计划，这层校验是下单前最后的防线，
+    # 毫秒级开销相对网络往返可忽略
+    if order_type == "market":
         order_request = MarketOrderRequest(
             symbol=symbol,
-            qty=args.qty,
+            qty=qty,
             side=side,
             time_in_force=TimeInForce.DAY,
         )
     else:
         order_request = LimitOrderRequest(
             symbol=symbol,
-            qty=args.qty,
+            qty=qty,
             side=side,
             time_in_force=TimeInForce.DAY,
-            limit_price=args.limit_price,
+            limit_price=limit_price,
         )
 
     order = client.submit_order(order_data=order_request)
     current_status = order_status_value(order)
-    for _ in range(args.wait_seconds):
-        time.sleep(1)
+    # 指数退避轮询：100ms 起步、封顶 1s。市价单常在百毫秒内成交，
+    # 固定 1s 间隔会白白多等；最长等待时间仍由 wait_seconds 控制。
+    deadline = time.monotonic() + wait_seconds
+    delay = 0.1
+    while current_status not in TERMINAL_ORDER_STATUSES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 1.0)
         order = client.get_order_by_id(order.id)
         current_status = order_status_value(order)
-        if current_status in TERMINAL_ORDER_STATUSES:
-            break
 
-    # 每笔交易后都记录快照；即便未成交也保留审计轨迹
-    account = client.get_account()
-    positions = client.get_all_positions()
-    normalized_positions = build_positions_from_alpaca(account, positions)
-    positions_details = build_positions_details(positions)
+    # 每笔交易后都记录快照；即便未成交也保留审计轨迹。
+    # 两个只读 REST 调用并发发出，总耗时取较慢者而非两者之和。
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        account_future = pool.submit(client.get_account)
+        positions_future = pool.submit(client.get_all_positions)
+        account = account_future.result()
+        positions = positions_future.result()
+    normalized_positions, positions_details = build_snapshot(account, positions)
 
     ts = get_dual_timestamps(order)
     filled_price = to_float_or_none(getattr(order, "filled_avg_price", None))
@@ -285,7 +410,7 @@ def main() -> None:
     position_file = base_dir / "position" / "position.jsonl"
     balance_file = base_dir / "balance" / "balance.jsonl"
 
-    next_id = get_next_id(position_file) + 1
+    next_id = read_last_id(position_file) + 1
     append_jsonl(
         position_file,
         {
@@ -294,11 +419,11 @@ def main() -> None:
             "timestamp_utc": ts["timestamp_utc"],
             "id": next_id,
             "this_action": {
-                "action": args.action,
+                "action": action,
                 "symbol": symbol,
-                "amount": args.qty,
+                "amount": qty,
                 "price": filled_price,
-                "order_type": args.order_type,
+                "order_type": order_type,
                 "limit_price": limit_price,
                 "order_status": current_status,
                 "source": "alpaca-skill",
@@ -306,8 +431,12 @@ def main() -> None:
             },
             "positions": normalized_positions,
         },
+        encoder=_encode_snapshot_row,
     )
+    write_last_id(position_file, next_id)
 
+    # balance 行不做内容去重：trade 子对象带 order_id/成交时间戳，每笔必不同，
+    # 且 query_trade_records 按 order_id 对账，跳行会直接丢记录
     append_jsonl(
         balance_file,
         {
@@ -315,10 +444,10 @@ def main() -> None:
             "timestamp_et": ts["timestamp_et"],
             "timestamp_utc": ts["timestamp_utc"],
             "trade": {
-                "action": args.action,
+                "action": action,
                 "symbol": symbol,
-                "qty": args.qty,
-                "order_type": args.order_type,
+                "qty": qty,
+                "order_type": order_type,
                 "limit_price": limit_price,
                 "order_status": current_status,
                 "filled_price": filled_price,
@@ -328,7 +457,7 @@ def main() -> None:
             },
             "account": {
                 "account_number": account.account_number,
-                "status": account.status.value if hasattr(account.status, "value") else str(account.status),
+                "status": _enum_str(account.status),
                 "cash": float(account.cash),
                 "buying_power": float(account.buying_power),
                 "portfolio_value": float(account.portfolio_value),
@@ -343,15 +472,16 @@ def main() -> None:
             },
             "positions": positions_details,
         },
+        encoder=_encode_snapshot_row,
     )
 
-    result = {
+    return {
         "operation": "submit_order",
         "status": current_status,
-        "action": args.action,
+        "action": action,
         "symbol": symbol,
-        "qty": args.qty,
-        "order_type": args.order_type,
+        "qty": qty,
+        "order_type": order_type,
         "limit_price": limit_price,
         "filled_price": filled_price,
         "order_id": str(order.id),
@@ -360,21 +490,195 @@ def main() -> None:
         "balance_file": str(balance_file),
     }
 
+
+# 进程内复用的 TradingClient（与 daemon 模式同理：一次建连，多单复用）
+_INPROC_CLIENT: Any = None
+_INPROC_PAPER: Optional[bool] = None
+
+
+def execute(
+    action: str,
+    symbol: str,
+    qty: int,
+    order_type: str = "market",
+    limit_price: Optional[float] = None,
+    wait_seconds: int = 15,
+) -> Dict[str, Any]:
+    """
+    进程内执行一笔交易，供流水线等调用方 import 后直接使用。
+
+    首次调用时创建并缓存 TradingClient，之后复用同一连接池；
+    相比逐单拉起子进程，省去每笔 ~100ms 的解释器启动与 JSON stdout 中转。
+    """
+    global _INPROC_CLIENT, _INPROC_PAPER
+    if _INPROC_CLIENT is None:
+        config = load_config()
+        api_key, secret_key, paper = get_alpaca_credentials(config)
+        client = TradingClient(api_key, secret_key, paper=paper)
+        _tune_session_pool(client)
+        _INPROC_CLIENT, _INPROC_PAPER = client, paper
+    return execute_trade(
+        _INPROC_CLIENT,
+        bool(_INPROC_PAPER),
+        action=action,
+        symbol=symbol,
+        qty=qty,
+        order_type=order_type,
+        limit_price=limit_price,
+        wait_seconds=wait_seconds,
+    )
+
+
+def run_daemon(client: Any, paper: bool) -> None:
+    """
+    常驻模式：从 stdin 逐行读取 JSON 指令并复用同一个 TradingClient，
+    批量交易免去每笔的进程启动 + TLS 握手开销。
+
+    指令格式: {"action": "buy", "symbol": "AAPL", "qty": 1,
+               "order_type": "market", "limit_price": null, "wait_seconds": 15}
+    每条指令输出一行 JSON 结果。
+    """
+    import sys as _sys
+
+    for line in _sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            cmd = json.loads(line)
+            action = cmd["action"]
+            if action not in ("buy", "sell"):
+                raise ValueError(f"未知 action: {action}")
+            result = execute_trade(
+                client,
+                paper,
+                action=action,
+                symbol=cmd["symbol"],
+                qty=int(cmd["qty"]),
+                order_type=cmd.get("order_type", "market"),
+                limit_price=cmd.get("limit_price"),
+                wait_seconds=int(cmd.get("wait_seconds", 15)),
+            )
+        except Exception as exc:  # 单条指令失败不终止守护进程
+            result = {"operation": "submit_order", "status": "error", "error": str(exc)}
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="执行/管理 Alpaca 交易并更新 position/balance")
+    parser.add_argument("--action", choices=["buy", "sell"], help="交易动作")
+    parser.add_argument("--symbol", help="股票代码，如 AAPL")
+    parser.add_argument("--qty", type=int, help="交易股数，正整数")
+    parser.add_argument("--order-type", choices=["market", "limit"], default="market", help="订单类型")
+    parser.add_argument("--limit-price", type=float, help="限价单价格（order-type=limit 时必填）")
+    parser.add_argument("--wait-seconds", type=int, default=15, help="提交后轮询订单状态秒数，默认 15")
+    parser.add_argument("--cancel-order-id", help="取消指定订单")
+    parser.add_argument("--cancel-all-open", action="store_true", help="取消所有未完成订单")
+    parser.add_argument("--daemon", action="store_true", help="常驻模式：从 stdin 逐行读取 JSON 交易指令")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    config = load_config()
+    api_key, secret_key, paper = get_alpaca_credentials(config)
+    client = TradingClient(api_key, secret_key, paper=paper)
+    _tune_session_pool(client)
+
+    if args.daemon:
+        run_daemon(client, paper)
+        raise SystemExit(0)
+
+    # 订单管理操作
+    if args.cancel_order_id:
+        client.cancel_order_by_id(args.cancel_order_id)
+        result = {
+            "operation": "cancel_order",
+            "order_id": args.cancel_order_id,
+            "status": "requested",
+            "paper": bool(paper),
+        }
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+        else:
+            mode = "Paper Trading" if paper else "Live Trading"
+            print(f"✅ 已提交撤单请求 ({mode})")
+            print(f"  订单号: {args.cancel_order_id}")
+        raise SystemExit(0)
+
+    if args.cancel_all_open:
+        responses = client.cancel_orders()
+        out = []
+        for r in responses:
+            out.append(
+                {
+                    "id": str(getattr(r, "id", "")),
+                    "status_code": int(getattr(r, "status", 0))
+                    if getattr(r, "status", None) is not None
+                    else None,
+                }
+            )
+        result = {
+            "operation": "cancel_all_open",
+            "cancelled_count": len(out),
+            "responses": out,
+            "paper": bool(paper),
+        }
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+        else:
+            mode = "Paper Trading" if paper else "Live Trading"
+            print(f"✅ 已提交批量撤单 ({mode})")
+            print(f"  撤单数量: {len(out)}")
+        raise SystemExit(0)
+
+    # 交易提交参数校验
+    if not args.action:
+        print("❌ 缺少操作，请使用 --action 或撤单参数")
+        raise SystemExit(1)
+    if not args.symbol:
+        print("❌ --symbol 必填")
+        raise SystemExit(1)
+    if args.qty is None or args.qty <= 0:
+        print("❌ --qty 必须为正整数")
+        raise SystemExit(1)
+    if args.order_type == "limit" and (args.limit_price is None or args.limit_price <= 0):
+        print("❌ 限价单必须提供有效的 --limit-price")
+        raise SystemExit(1)
+    if args.order_type == "market" and args.limit_price is not None:
+        print("❌ 市价单不需要 --limit-price")
+        raise SystemExit(1)
+    if args.wait_seconds < 0:
+        print("❌ --wait-seconds 不能小于 0")
+        raise SystemExit(1)
+
+    result = execute_trade(
+        client,
+        paper,
+        action=args.action,
+        symbol=args.symbol,
+        qty=args.qty,
+        order_type=args.order_type,
+        limit_price=args.limit_price,
+        wait_seconds=args.wait_seconds,
+    )
+    current_status = result["status"]
+    limit_price = result["limit_price"]
+    filled_price = result["filled_price"]
+
     if args.json:
         print(json.dumps(result, ensure_ascii=False, indent=2))
     else:
         mode = "Paper Trading" if paper else "Live Trading"
         icon = "✅" if current_status in {"filled", "partially_filled"} else "⏳"
         print(f"{icon} 订单已提交 ({mode})")
-        print(f"  动作: {args.action.upper()} {symbol} x {args.qty}")
+        print(f"  动作: {args.action.upper()} {result['symbol']} x {args.qty}")
         print(f"  类型: {args.order_type.upper()}")
         if limit_price is not None:
             print(f"  限价: ${limit_price:.2f}")
         print(f"  状态: {current_status}")
         print(f"  成交均价: ${filled_price:.2f}" if filled_price is not None else "  成交均价: N/A")
-        print(f"  订单号: {order.id}")
-        print(f"  position: {position_file}")
-        print(f"  balance: {balance_file}")
+        print(f"  订单号: {result['order_id']}")
+        print(f"  position: {result['position_file']}")
+        print(f"  balance: {result['balance_file']}")
 
     if current_status in {"canceled", "expired", "rejected"}:
         raise SystemExit(1)
@@ -10,9 +10,12 @@
 
 from __future__ import annotations
 
+import os
 import sys
 import json
 import argparse
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, Dict, List, Any
@@ -58,8 +61,14 @@ def get_now_timestamps() -> Dict[str, str]:
 
 def append_jsonl(path: Path, row: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    payload = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+    # O_APPEND 下的单次 write 由内核保证追加原子性（并发写者安全），
+    # 写法与 execute_alpaca_trade.append_jsonl 保持一致
+    fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
 
 
 def build_position_snapshot(positions: List[Dict[str, Any]], cash: float) -> Dict[str, Any]:
@@ -141,17 +150,21 @@ def ensure_local_record_files(account: Dict[str, Any], positions: List[Dict[str,
     }
 
 
-def get_alpaca_client() -> Optional[TradingClient]:
+def get_alpaca_client(config: Optional[Dict[str, Any]] = None) -> Optional[TradingClient]:
     """
     获取 Alpaca 客户端（从 config.yaml 读取凭证）
 
+    Args:
+        config: 已加载的配置字典，为空则自动加载
+
     Returns:
         TradingClient 实例或 None
     """
     if not ALPACA_AVAILABLE:
         return None
 
-    config = load_config()
+    if config is None:
+        config = load_config()
     api_key, secret_key, paper = get_alpaca_credentials(config)
 
     return TradingClient(api_key, secret_key, paper=paper)
@@ -281,8 +294,8 @@ def main():
     print(f"💰 Alpaca {mode_str} 账户状态")
     print("=" * 60)
 
-    # 获取客户端
-    client = get_alpaca_client()
+    # 获取客户端（复用上面已加载的配置，避免重复解析）
+    client = get_alpaca_client(config)
     if not client:
         sys.exit(1)
 
@@ -290,10 +303,14 @@ def main():
     print()
 
     try:
-        # 获取账户信息
-        account = get_account_info(client)
-        # 获取持仓（用于输出 + 初始化本地文件）
-        positions = get_positions(client)
+        # 账户/持仓/订单是三个独立的只读 REST 调用，并发发出后
+        # 总耗时约等于最慢一跳，而非三次往返之和
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            account_future = pool.submit(get_account_info, client)
+            positions_future = pool.submit(get_positions, client)
+            orders_future = pool.submit(get_recent_orders, client) if args.orders else None
+            account = account_future.result()
+            positions = positions_future.result()
         init_result = ensure_local_record_files(account, positions)
 
         if args.json:
@@ -325,7 +342,6 @@ def main():
             if not positions:
                 print("  (无持仓)")
             else:
-                total_unrealized = 0
                 for pos in positions:
                     print(f"  {pos['symbol']}: {pos['qty']:.0f} 股")
                     print(f"    成本价: {format_currency(pos['avg_entry_price'])}")
@@ -333,14 +349,15 @@ def main():
                     print(f"    市值: {format_currency(pos['market_value'])}")
                     print(f"    盈亏: {format_currency(pos['unrealized_pl'])} ({format_percent(pos['unrealized_plpc'])})")
                     print()
-                    total_unrealized += pos['unrealized_pl']
 
+                # fsum 补偿累加误差，大持仓组合下也无浮点漂移
+                total_unrealized = math.fsum(pos['unrealized_pl'] for pos in positions)
                 print(f"  总未实现盈亏: {format_currency(total_unrealized)}")
             print()
 
-        # 获取订单
-        if args.orders:
-            orders = get_recent_orders(client)
+        # 获取订单（请求已与账户/持仓并发发出）
+        if orders_future is not None:
+            orders = orders_future.result()
 
             if args.json:
                 output["orders"] = orders
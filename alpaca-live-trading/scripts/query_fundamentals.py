@@ -11,14 +11,38 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import requests
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        """orjson 直接产出 bytes（2 缩进），比 stdlib json 快数倍且少一次 str 中转。"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+
+except ImportError:
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    _loads = json.loads
+
 # 将 scripts 目录加入 Python 路径以导入 _config
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from _config import get_alphavantage_key, load_config
@@ -28,9 +52,54 @@ _config = load_config()
 API_KEY = get_alphavantage_key(_config)
 DEFAULT_ALPHA_REQUEST_INTERVAL = 0.8  # 付费版 75 次/分钟
 
+# 模块级 Session：连接池复用 TLS 会话，省去每次调用 ~100-300ms 的握手；
+# 自带对限流/服务端错误的指数退避重试
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=requests.adapters.Retry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    ),
+)
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
+
+# 基本面数据按季度更新，当日内重复调用直接读磁盘缓存：
+# 免网络往返，也不消耗 AlphaVantage 配额（免费版仅 25 次/天）
+_FUND_CACHE_DIR = Path.home() / ".cache" / "alpaca_fundamentals"
+
+
+class _RateLimiter:
+    """
+    线程安全的最小间隔限速器：控制请求「发起」的间隔而非阻塞整条流水线，
+    让并发请求在遵守 75 次/分钟配额的同时重叠网络往返。
+    """
+
+    def __init__(self, interval: float):
+        self.interval = max(interval, 0.0)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# AlphaVantage 的空值哨兵；frozenset 哈希查找，且只对 str 生效避免误伤数值
+_BAD_VALUES = frozenset({"", "None", "null", "-"})
+
 
 def _to_float(value: Any) -> Optional[float]:
-    if value in (None, "", "None", "null", "-"):
+    if value is None or (isinstance(value, str) and value in _BAD_VALUES):
         return None
     try:
         return float(value)
@@ -44,145 +113,226 @@ def _safe_div(n: Optional[float], d: Optional[float]) -> Optional[float]:
     return n / d
 
 
-def _parse_date(text: str) -> Optional[datetime]:
-    if not text:
-        return None
+def _fund_cache_path(function_name: str, symbol: str) -> Path:
+    # 按 (接口, 股票, 当天日期) 命名，跨天自动失效
+    return _FUND_CACHE_DIR / f"{function_name}_{symbol}_{datetime.now().strftime('%Y-%m-%d')}.json"
+
+
+def _fund_cache_get(cache_path: Path) -> Optional[Dict[str, Any]]:
     try:
-        return datetime.strptime(text, "%Y-%m-%d")
-    except ValueError:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
         return None
 
 
-def _fetch_alpha_vantage(function_name: str, symbol: str, timeout: int = 30) -> Dict[str, Any]:
+def _fund_cache_set(cache_path: Path, payload: Dict[str, Any]) -> None:
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _fetch_alpha_vantage(
+    function_name: str,
+    symbol: str,
+    timeout: int = 30,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    cache_path = _fund_cache_path(function_name, symbol)
+    if use_cache:
+        cached = _fund_cache_get(cache_path)
+        if cached is not None:
+            return cached
+
     params = {
         "function": function_name,
         "symbol": symbol,
         "apikey": API_KEY,
     }
-    response = requests.get(BASE_URL, params=params, timeout=timeout)
+    response = _SESSION.get(BASE_URL, params=params, timeout=timeout)
     response.raise_for_status()
-    payload = response.json()
+    # 基本面 payload 可达数百 KB，orjson 解码比 response.json() 快 2-5 倍
+    payload = _loads(response.content)
     if "Error Message" in payload:
         raise RuntimeError(f"{function_name} 接口错误: {payload['Error Message']}")
     if "Note" in payload:
         raise RuntimeError(f"{function_name} 调用受限: {payload['Note']}")
+    _fund_cache_set(cache_path, payload)
     return payload
 
 
+# OVERVIEW 字段提取表：数据驱动代替 15 次手写 _to_float 调用
+_OVERVIEW_STR_FIELDS = (
+    ("symbol", "Symbol"),
+    ("name", "Name"),
+    ("sector", "Sector"),
+    ("industry", "Industry"),
+)
+_OVERVIEW_FLOAT_FIELDS = (
+    ("market_cap", "MarketCapitalization"),
+    ("pe_ratio", "PERatio"),
+    ("peg_ratio", "PEGRatio"),
+    ("price_to_book", "PriceToBookRatio"),
+    ("eps_ttm", "EPS"),
+    ("profit_margin", "ProfitMargin"),
+    ("operating_margin_ttm", "OperatingMarginTTM"),
+    ("roe_ttm", "ReturnOnEquityTTM"),
+    ("roa_ttm", "ReturnOnAssetsTTM"),
+    ("revenue_ttm", "RevenueTTM"),
+    ("gross_profit_ttm", "GrossProfitTTM"),
+    ("analyst_target_price", "AnalystTargetPrice"),
+)
+
+
 def _extract_overview(overview: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        "symbol": overview.get("Symbol"),
-        "name": overview.get("Name"),
-        "sector": overview.get("Sector"),
-        "industry": overview.get("Industry"),
-        "market_cap": _to_float(overview.get("MarketCapitalization")),
-        "pe_ratio": _to_float(overview.get("PERatio")),
-        "peg_ratio": _to_float(overview.get("PEGRatio")),
-        "price_to_book": _to_float(overview.get("PriceToBookRatio")),
-        "eps_ttm": _to_float(overview.get("EPS")),
-        "profit_margin": _to_float(overview.get("ProfitMargin")),
-        "operating_margin_ttm": _to_float(overview.get("OperatingMarginTTM")),
-        "roe_ttm": _to_float(overview.get("ReturnOnEquityTTM")),
-        "roa_ttm": _to_float(overview.get("ReturnOnAssetsTTM")),
-        "revenue_ttm": _to_float(overview.get("RevenueTTM")),
-        "gross_profit_ttm": _to_float(overview.get("GrossProfitTTM")),
-        "analyst_target_price": _to_float(overview.get("AnalystTargetPrice")),
-    }
+    get = overview.get
+    out = {key: get(source) for key, source in _OVERVIEW_STR_FIELDS}
+    out.update({key: _to_float(get(source)) for key, source in _OVERVIEW_FLOAT_FIELDS})
+    return out
 
 
 def _extract_recent_reports(reports: List[Dict[str, Any]], cutoff: datetime, max_items: int = 4) -> List[Dict[str, Any]]:
-    filtered: List[Dict[str, Any]] = []
-    for item in reports:
-        dt = _parse_date(item.get("fiscalDateEnding", ""))
-        if dt is None or dt < cutoff:
-            continue
-        filtered.append(item)
-    filtered.sort(key=lambda x: x.get("fiscalDateEnding", ""), reverse=True)
+    # fiscalDateEnding 固定为 YYYY-MM-DD，字典序即时间序，
+    # 直接字符串比较即可，省去逐条 strptime
+    cutoff_str = cutoff.strftime("%Y-%m-%d")
+    filtered = [item for item in reports if item.get("fiscalDateEnding", "") >= cutoff_str]
+    filtered.sort(key=lambda x: x["fiscalDateEnding"], reverse=True)
     return filtered[:max_items]
 
 
-def _build_quarterly_metrics(
-    income_reports: List[Dict[str, Any]],
-    balance_reports: List[Dict[str, Any]],
-    cashflow_reports: List[Dict[str, Any]],
-    earnings_reports: List[Dict[str, Any]],
-) -> List[Dict[str, Any]]:
-    by_date: Dict[str, Dict[str, Any]] = {}
+def _extract_income(row: Dict[str, Any]) -> Dict[str, Any]:
+    revenue = _to_float(row.get("totalRevenue"))
+    gross_profit = _to_float(row.get("grossProfit"))
+    operating_income = _to_float(row.get("operatingIncome"))
+    net_income = _to_float(row.get("netIncome"))
+    return {
+        "revenue": revenue,
+        "gross_profit": gross_profit,
+        "operating_income": operating_income,
+        "net_income": net_income,
+        "gross_margin": _safe_div(gross_profit, revenue),
+        "operating_margin": _safe_div(operating_income, revenue),
+        "net_margin": _safe_div(net_income, revenue),
+    }
+
+
+def _extract_balance(row: Dict[str, Any]) -> Dict[str, Any]:
+    equity = _to_float(row.get("totalShareholderEquity"))
+    current_debt = _to_float(row.get("currentDebt"))
+    long_term_debt = _to_float(row.get("longTermDebt"))
+    total_debt = (current_debt or 0.0) + (long_term_debt or 0.0)
+    return {
+        "total_assets": _to_float(row.get("totalAssets")),
+        "total_liabilities": _to_float(row.get("totalLiabilities")),
+        "total_shareholder_equity": equity,
+        "current_debt": current_debt,
+        "long_term_debt": long_term_debt,
+        "debt_to_equity": _safe_div(total_debt, equity),
+    }
+
+
+def _extract_cashflow(row: Dict[str, Any]) -> Dict[str, Any]:
+    operating_cf = _to_float(row.get("operatingCashflow"))
+    capex = _to_float(row.get("capitalExpenditures"))
+    free_cf = None
+    if operating_cf is not None and capex is not None:
+        free_cf = operating_cf + capex  # capex 通常为负数
+    return {
+        "operating_cashflow": operating_cf,
+        "capital_expenditures": capex,
+        "free_cashflow": free_cf,
+    }
+
+
+def _extract_earnings(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "reported_eps": _to_float(row.get("reportedEPS")),
+        "estimated_eps": _to_float(row.get("estimatedEPS")),
+        "surprise_pct": _to_float(row.get("surprisePercentage")),
+    }
+
 
+# 行数达到该规模时 income 指标改走 numpy 向量化（逐行 Python 除法开始占优时间）
+_NP_MIN_ROWS = 16
+
+
+def _merge_income_np(by_date: Dict[str, Dict[str, Any]], income_reports: List[Dict[str, Any]]) -> None:
+    """
+    income 指标的向量化路径：四列一次转 float64（None→NaN），
+    三个 margin 用一次向量化除法算完，结果 NaN 映射回 None 保持 JSON 口径。
+    """
+    dates: List[str] = []
+    columns: List[List[Optional[float]]] = [[], [], [], []]
     for row in income_reports:
         d = row.get("fiscalDateEnding")
         if not d:
             continue
-        item = by_date.setdefault(d, {"fiscal_date_ending": d})
-        revenue = _to_float(row.get("totalRevenue"))
-        gross_profit = _to_float(row.get("grossProfit"))
-        operating_income = _to_float(row.get("operatingIncome"))
-        net_income = _to_float(row.get("netIncome"))
-        item.update(
-            {
-                "revenue": revenue,
-                "gross_profit": gross_profit,
-                "operating_income": operating_income,
-                "net_income": net_income,
-                "gross_margin": _safe_div(gross_profit, revenue),
-                "operating_margin": _safe_div(operating_income, revenue),
-                "net_margin": _safe_div(net_income, revenue),
-            }
-        )
+        dates.append(d)
+        columns[0].append(_to_float(row.get("totalRevenue")))
+        columns[1].append(_to_float(row.get("grossProfit")))
+        columns[2].append(_to_float(row.get("operatingIncome")))
+        columns[3].append(_to_float(row.get("netIncome")))
 
-    for row in balance_reports:
-        d = row.get("fiscalDateEnding")
-        if not d:
-            continue
-        item = by_date.setdefault(d, {"fiscal_date_ending": d})
-        assets = _to_float(row.get("totalAssets"))
-        liabilities = _to_float(row.get("totalLiabilities"))
-        equity = _to_float(row.get("totalShareholderEquity"))
-        current_debt = _to_float(row.get("currentDebt"))
-        long_term_debt = _to_float(row.get("longTermDebt"))
-        total_debt = (current_debt or 0.0) + (long_term_debt or 0.0)
-        item.update(
-            {
-                "total_assets": assets,
-                "total_liabilities": liabilities,
-                "total_shareholder_equity": equity,
-                "current_debt": current_debt,
-                "long_term_debt": long_term_debt,
-                "debt_to_equity": _safe_div(total_debt, equity),
-            }
-        )
+    def _as_arr(values: List[Optional[float]]):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
 
-    for row in cashflow_reports:
-        d = row.get("fiscalDateEnding")
-        if not d:
-            continue
-        item = by_date.setdefault(d, {"fiscal_date_ending": d})
-        operating_cf = _to_float(row.get("operatingCashflow"))
-        capex = _to_float(row.get("capitalExpenditures"))
-        free_cf = None
-        if operating_cf is not None and capex is not None:
-            free_cf = operating_cf + capex  # capex 通常为负数
-        item.update(
-            {
-                "operating_cashflow": operating_cf,
-                "capital_expenditures": capex,
-                "free_cashflow": free_cf,
-            }
-        )
+    revenue, gross, operating, net = (_as_arr(c) for c in columns)
+    valid = ~np.isnan(revenue) & (revenue != 0)
 
-    for row in earnings_reports:
-        d = row.get("fiscalDateEnding")
-        if not d:
-            continue
-        item = by_date.setdefault(d, {"fiscal_date_ending": d})
-        item.update(
+    def _margin(numerator):
+        out = np.full_like(revenue, np.nan)
+        np.divide(numerator, revenue, out=out, where=valid)
+        return out
+
+    gross_m, operating_m, net_m = _margin(gross), _margin(operating), _margin(net)
+
+    def _back(x: float) -> Optional[float]:
+        return None if x != x else x  # NaN != NaN
+
+    for i, d in enumerate(dates):
+        by_date.setdefault(d, {"fiscal_date_ending": d}).update(
             {
-                "reported_eps": _to_float(row.get("reportedEPS")),
-                "estimated_eps": _to_float(row.get("estimatedEPS")),
-                "surprise_pct": _to_float(row.get("surprisePercentage")),
+                "revenue": _back(revenue[i]),
+                "gross_profit": _back(gross[i]),
+                "operating_income": _back(operating[i]),
+                "net_income": _back(net[i]),
+                "gross_margin": _back(gross_m[i]),
+                "operating_margin": _back(operating_m[i]),
+                "net_margin": _back(net_m[i]),
             }
         )
 
+
+def _build_quarterly_metrics(
+    income_reports: List[Dict[str, Any]],
+    balance_reports: List[Dict[str, Any]],
+    cashflow_reports: List[Dict[str, Any]],
+    earnings_reports: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    # 四个数据源走同一个参数化合并循环：每源一个提取器，
+    # by_date 一次建成、末尾统一排序
+    by_date: Dict[str, Dict[str, Any]] = {}
+    if np is not None and len(income_reports) >= _NP_MIN_ROWS:
+        _merge_income_np(by_date, income_reports)
+        income_reports = []
+    sources = (
+        (income_reports, _extract_income),
+        (balance_reports, _extract_balance),
+        (cashflow_reports, _extract_cashflow),
+        (earnings_reports, _extract_earnings),
+    )
+    for reports, extract in sources:
+        for row in reports:
+            d = row.get("fiscalDateEnding")
+            if not d:
+                continue
+            by_date.setdefault(d, {"fiscal_date_ending": d}).update(extract(row))
+
     merged = list(by_date.values())
     merged.sort(key=lambda x: x["fiscal_date_ending"], reverse=True)
     return merged
@@ -192,15 +342,22 @@ def fetch_fundamentals_for_symbol(
     symbol: str,
     days: int = 365,
     endpoint_request_interval: float = DEFAULT_ALPHA_REQUEST_INTERVAL,
+    rate_limiter: Optional[_RateLimiter] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     cutoff = datetime.now() - timedelta(days=max(days, 1))
 
+    # 5 个基本面接口互不依赖，并发发出；限速器只错开发起时刻，
+    # 总耗时从「5 次往返 + 4 次 sleep」降到约一次往返
     funcs = ["OVERVIEW", "INCOME_STATEMENT", "BALANCE_SHEET", "CASH_FLOW", "EARNINGS"]
-    payloads: Dict[str, Dict[str, Any]] = {}
-    for idx, fn in enumerate(funcs):
-        payloads[fn] = _fetch_alpha_vantage(fn, symbol)
-        if endpoint_request_interval > 0 and idx < len(funcs) - 1:
-            time.sleep(endpoint_request_interval)
+    limiter = rate_limiter or _RateLimiter(endpoint_request_interval)
+
+    def _fetch_one(fn: str) -> Dict[str, Any]:
+        limiter.wait()
+        return _fetch_alpha_vantage(fn, symbol, use_cache=use_cache)
+
+    with ThreadPoolExecutor(max_workers=len(funcs)) as pool:
+        payloads = dict(zip(funcs, pool.map(_fetch_one, funcs)))
 
     overview = payloads["OVERVIEW"]
     income = payloads["INCOME_STATEMENT"]
@@ -293,6 +450,11 @@ def main() -> None:
         default=DEFAULT_ALPHA_REQUEST_INTERVAL,
         help="同一股票内各基本面接口调用间隔秒数（默认 0.8）",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="跳过磁盘缓存强制请求 API（默认当日内复用缓存）",
+    )
     args = parser.parse_args()
 
     tickers = [x.strip().upper() for x in args.tickers.split(",") if x.strip()]
@@ -300,23 +462,29 @@ def main() -> None:
         print("❌ --tickers 不能为空")
         raise SystemExit(1)
 
-    all_results: List[Dict[str, Any]] = []
-    for i, ticker in enumerate(tickers):
+    # 所有接口调用共享一个限速器（统一配额），多只股票并发抓取：
+    # 总耗时由配额决定，而非各股票串行延迟之和
+    limiter = _RateLimiter(max(args.endpoint_request_interval, args.request_interval, 0.0))
+
+    def _fetch_ticker(ticker: str) -> Dict[str, Any]:
         try:
             print(f"🔄 获取 {ticker} 基本面数据...")
             payload = fetch_fundamentals_for_symbol(
                 ticker,
                 days=args.days,
-                endpoint_request_interval=max(args.endpoint_request_interval, 0.0),
+                rate_limiter=limiter,
+                use_cache=not args.no_cache,
             )
-            all_results.append(payload)
             print(f"✅ {ticker} 完成")
+            return payload
         except Exception as e:
-            all_results.append({"symbol": ticker, "error": str(e)})
             print(f"❌ {ticker} 失败: {e}")
+            return {"symbol": ticker, "error": str(e)}
 
-        if args.request_interval > 0 and i < len(tickers) - 1:
-            time.sleep(args.request_interval)
+    # 每只股票 5 个接口，75 次/分钟配额下最多 15 组并发
+    max_workers = max(1, min(len(tickers), 75 // 5))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        all_results: List[Dict[str, Any]] = list(pool.map(_fetch_ticker, tickers))
 
     output = {
         "source": "AlphaVantage",
@@ -330,11 +498,12 @@ def main() -> None:
     if args.output_file:
         out_path = Path(args.output_file)
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding="utf-8")
+        out_path.write_bytes(_dumps_pretty(output))
         print(f"💾 已写入: {out_path}")
 
     if args.json:
-        print(json.dumps(output, ensure_ascii=False, indent=2))
+        sys.stdout.buffer.write(_dumps_pretty(output) + b"\n")
+        sys.stdout.flush()
     else:
         valid_rows = [x for x in all_results if not x.get("error")]
         print_human_readable(valid_rows)
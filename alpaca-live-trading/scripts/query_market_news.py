@@ -12,8 +12,13 @@
 import sys
 import json
 import argparse
+import random
+import threading
 import time
 import requests
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -22,12 +27,42 @@ from typing import Optional, List, Dict, Any
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from _config import load_config, get_alphavantage_key
+from _cache import cache_get, cache_set
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_NAN = float("nan")
 
 # 从 config.yaml 加载 AlphaVantage API Key
 _config = load_config()
 APIKEY = get_alphavantage_key(_config)
 BASE_URL = "https://www.alphavantage.co/query"
 DEFAULT_ALPHA_REQUEST_INTERVAL = 0.8  # 付费版 75 次/分钟
+NEWS_CACHE_TTL = 300  # NEWS_SENTIMENT 磁盘缓存 TTL（秒）：命中免延迟也免配额
+
+# 模块级 Session：复用 TLS 连接并对限流/服务端错误自动退避重试
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=requests.adapters.Retry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    ),
+)
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
 
 # 支持的新闻主题
 SUPPORTED_TOPICS = [
@@ -38,21 +73,62 @@ SUPPORTED_TOPICS = [
 ]
 
 
+class TokenBucket:
+    """
+    线程安全令牌桶限速器。
+
+    按 rate（令牌/秒）匀速放行并允许小幅突发，避免 429。与固定间隔
+    sleep 不同，节流与并发解耦：多个工作线程共享同一个桶。
+
+    初始令牌刻意只给 burst 个而非灌满 capacity：满桶起步意味着首分钟
+    可放行「capacity + 60 秒补充量」≈ 两倍配额，75 次/分钟 的额度会被
+    突破；近空起步则从第一次调用起就以补充速率为实际上限。
+    """
+
+    def __init__(self, rate: float, capacity: float = 75.0, burst: float = 3.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(burst, capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """阻塞直到取得一个令牌。"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
 def _split_tickers(tickers: Optional[str]) -> List[str]:
     if not tickers:
         return []
     return [t.strip().upper() for t in tickers.split(",") if t.strip()]
 
 
-def _extract_ticker_sentiment(article: Dict[str, Any], ticker: str) -> Optional[float]:
-    ticker = ticker.upper()
-    for item in article.get("ticker_sentiment", []):
-        if str(item.get("ticker", "")).upper() == ticker:
-            try:
-                return float(item.get("ticker_sentiment_score"))
-            except (TypeError, ValueError):
-                return None
-    return None
+def _safe_float(value: Any) -> float:
+    """解析失败返回 NaN（作缺失值），便于整批交给 nanmean 聚合。"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def _mean_or_none(scores: List[float]) -> Optional[float]:
+    """求均值，NaN 视为缺失；numpy 可用时走 C 级 nanmean，免逐值 Python 循环。"""
+    if np is not None:
+        arr = np.fromiter(scores, dtype=np.float64, count=len(scores))
+        if np.isfinite(arr).any():
+            return round(float(np.nanmean(arr)), 6)
+        return None
+    finite = [s for s in scores if s == s]
+    return round(sum(finite) / len(finite), 6) if finite else None
 
 
 def fetch_news_per_ticker(
@@ -63,78 +139,154 @@ def fetch_news_per_ticker(
     time_to: Optional[str] = None,
     sort: str = "LATEST",
     request_interval: float = 0.0,
+    max_concurrent: int = 8,
+    use_cache: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     逐只股票查询新闻，返回按 ticker 分组结果（分析前置场景）。
+
+    各 ticker 的请求纯 I/O 绑定且互相独立，用线程池并发发出，
+    总耗时从 N 次串行 RTT 降为约一次 RTT；max_concurrent=1 即退回串行。
+    节流由共享令牌桶控制：稳态速率 1/request_interval 次/秒，允许突发。
     """
-    grouped_results: List[Dict[str, Any]] = []
-    for idx, ticker in enumerate(tickers):
-        articles = fetch_news(
+    bucket = TokenBucket(rate=1.0 / request_interval) if request_interval > 0 else None
+
+    def _fetch_one(ticker: str) -> List[Dict[str, Any]]:
+        if bucket is not None:
+            bucket.acquire()
+        return fetch_news(
             tickers=ticker,
             topics=topics,
             time_from=time_from,
             time_to=time_to,
             sort=sort,
             limit=per_ticker_limit,
+            use_cache=use_cache,
         )
 
-        normalized_articles: List[Dict[str, Any]] = []
-        overall_scores: List[float] = []
-        ticker_scores: List[float] = []
-
-        for a in articles:
-            try:
-                overall_score = float(a.get("overall_sentiment_score", 0))
-                overall_scores.append(overall_score)
-            except (TypeError, ValueError):
-                overall_score = None
-
-            ticker_score = _extract_ticker_sentiment(a, ticker)
-            if ticker_score is not None:
-                ticker_scores.append(ticker_score)
-
-            normalized_articles.append(
-                {
-                    "title": a.get("title", ""),
-                    "url": a.get("url", ""),
-                    "source": a.get("source", ""),
-                    "time_published": a.get("time_published", ""),
-                    "time_published_readable": parse_time_published(a.get("time_published", "")),
-                    "overall_sentiment_label": a.get("overall_sentiment_label", ""),
-                    "overall_sentiment_score": overall_score,
-                    "target_ticker_sentiment_score": ticker_score,
-                    "target_ticker_sentiment_label": (
-                        next(
-                            (
-                                s.get("ticker_sentiment_label", "")
-                                for s in a.get("ticker_sentiment", [])
-                                if str(s.get("ticker", "")).upper() == ticker
-                            ),
-                            "",
-                        )
-                    ),
-                    "summary": a.get("summary", ""),
-                }
+    workers = max(1, min(len(tickers), max_concurrent))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        feeds = list(pool.map(_fetch_one, tickers))
+
+    return [_normalize_group(ticker, articles) for ticker, articles in zip(tickers, feeds)]
+
+
+@dataclass(slots=True)
+class NewsArticle:
+    """归一化后的单篇新闻；slots 实例比同形 dict 分配更快且省约四成内存。"""
+
+    title: str
+    url: str
+    source: str
+    time_published: str
+    time_published_readable: str
+    overall_sentiment_label: str
+    overall_sentiment_score: Optional[float]
+    target_ticker_sentiment_score: Optional[float]
+    target_ticker_sentiment_label: str
+    summary: str
+
+
+def _normalize_group(ticker: str, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """将一只股票的原始文章列表归一化为分组结果（含情绪均值聚合）。"""
+    normalized_articles: List[NewsArticle] = []
+    overall_scores: List[float] = []
+    ticker_scores: List[float] = []
+
+    target = ticker.upper()
+    for a in articles:
+        overall_score = _safe_float(a.get("overall_sentiment_score", 0))
+        overall_scores.append(overall_score)
+        if overall_score != overall_score:
+            overall_score = None
+
+        # 每篇文章只建一次 ticker -> 情绪条目 的索引，分数/标签两次取值都 O(1)
+        ts_map = {str(s.get("ticker", "")).upper(): s for s in a.get("ticker_sentiment", [])}
+        ts_entry = ts_map.get(target, {})
+        ticker_score = _safe_float(ts_entry.get("ticker_sentiment_score"))
+        ticker_scores.append(ticker_score)
+        if ticker_score != ticker_score:
+            ticker_score = None
+
+        normalized_articles.append(
+            NewsArticle(
+                title=a.get("title", ""),
+                url=a.get("url", ""),
+                source=a.get("source", ""),
+                time_published=a.get("time_published", ""),
+                time_published_readable=parse_time_published(a.get("time_published", "")),
+                overall_sentiment_label=a.get("overall_sentiment_label", ""),
+                overall_sentiment_score=overall_score,
+                target_ticker_sentiment_score=ticker_score,
+                target_ticker_sentiment_label=ts_entry.get("ticker_sentiment_label", ""),
+                summary=a.get("summary", ""),
             )
-
-        grouped_results.append(
-            {
-                "ticker": ticker,
-                "news_count": len(normalized_articles),
-                "avg_overall_sentiment_score": (
-                    round(sum(overall_scores) / len(overall_scores), 6) if overall_scores else None
-                ),
-                "avg_ticker_sentiment_score": (
-                    round(sum(ticker_scores) / len(ticker_scores), 6) if ticker_scores else None
-                ),
-                "articles": normalized_articles,
-            }
         )
 
-        if request_interval > 0 and idx < len(tickers) - 1:
-            time.sleep(request_interval)
+    return {
+        "ticker": ticker,
+        "news_count": len(normalized_articles),
+        "avg_overall_sentiment_score": _mean_or_none(overall_scores),
+        "avg_ticker_sentiment_score": _mean_or_none(ticker_scores),
+        # JSON 序列化与展示仍消费 dict，出组时一次性转换
+        "articles": [asdict(x) for x in normalized_articles],
+    }
 
-    return grouped_results
+
+def fetch_news_batched(
+    tickers: List[str],
+    per_ticker_limit: int = 5,
+    topics: Optional[str] = None,
+    time_from: Optional[str] = None,
+    time_to: Optional[str] = None,
+    sort: str = "LATEST",
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    单次 NEWS_SENTIMENT 调用覆盖全部 tickers，再按 ticker_sentiment 分桶。
+
+    N 只股票只消耗 1 次请求与 1 个配额单位，总耗时 1 次 RTT；
+    代价是各股票共享同一份 feed，冷门股票的候选文章可能少于逐股票查询。
+    """
+    fetch_limit = min(1000, per_ticker_limit * len(tickers) * 2)
+    articles = fetch_news(
+        tickers=",".join(tickers),
+        topics=topics,
+        time_from=time_from,
+        time_to=time_to,
+        sort=sort,
+        limit=fetch_limit,
+        use_cache=use_cache,
+    )
+
+    buckets: Dict[str, List[Dict[str, Any]]] = {t: [] for t in tickers}
+    upper_to_ticker = {t.upper(): t for t in tickers}
+    for a in articles:
+        for s in a.get("ticker_sentiment", []):
+            t = upper_to_ticker.get(str(s.get("ticker", "")).upper())
+            if t is not None and len(buckets[t]) < per_ticker_limit:
+                buckets[t].append(a)
+
+    return [_normalize_group(t, buckets[t]) for t in tickers]
+
+
+# 请求参数模板：apikey/function 进程内不变，热路径上只做一次字面量展开
+_BASE_PARAMS = {"function": "NEWS_SENTIMENT", "apikey": APIKEY}
+
+# AlphaVantage 限流有两种形态：HTTP 429，或 HTTP 200 但 body 带 Note/提示语
+_MAX_RETRIES = 3
+_RATE_LIMIT_MARKERS = ("rate limit", "Thank you")
+
+
+def _is_rate_limited(response: requests.Response, data: Optional[Dict[str, Any]]) -> bool:
+    if response.status_code == 429:
+        return True
+    if not isinstance(data, dict):
+        return False
+    if "Note" in data:
+        return True
+    info = data.get("Information", "")
+    return isinstance(info, str) and any(marker in info for marker in _RATE_LIMIT_MARKERS)
 
 
 def fetch_news(
@@ -144,6 +296,7 @@ def fetch_news(
     time_to: Optional[str] = None,
     sort: str = "LATEST",
     limit: int = 20,
+    use_cache: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     从 AlphaVantage NEWS_SENTIMENT API 获取新闻
@@ -159,12 +312,7 @@ def fetch_news(
     Returns:
         新闻文章列表
     """
-    params = {
-        "function": "NEWS_SENTIMENT",
-        "apikey": APIKEY,
-        "sort": sort,
-        "limit": limit,
-    }
+    params = {**_BASE_PARAMS, "sort": sort, "limit": limit}
 
     if tickers:
         params["tickers"] = tickers
@@ -175,23 +323,83 @@ def fetch_news(
     if time_to:
         params["time_to"] = time_to
 
-    try:
-        response = requests.get(BASE_URL, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+    if use_cache:
+        cached = cache_get(BASE_URL, params, NEWS_CACHE_TTL)
+        if cached is not None:
+            return cached.get("feed", [])[:limit]
+
+    last_note = None
+    for attempt in range(_MAX_RETRIES):
+        try:
+            response = _SESSION.get(BASE_URL, params=params, timeout=30)
+
+            data = None
+            if response.status_code == 200:
+                # NEWS_SENTIMENT payload 较大，orjson 解码比 response.json() 快 2-5 倍
+                data = _loads(response.content)
+
+            if _is_rate_limited(response, data):
+                # 软限流：指数退避后重试，避免整批查询直接作废
+                last_note = (data or {}).get("Note") or (data or {}).get("Information") or "HTTP 429"
+                if attempt < _MAX_RETRIES - 1:
+                    time.sleep(min(16, 2 ** attempt) + random.random() * 0.25)
+                    continue
+                raise Exception(f"API 调用限制: {last_note}")
+
+            response.raise_for_status()
 
-        if "Error Message" in data:
-            raise Exception(f"API 错误: {data['Error Message']}")
-        if "Note" in data:
-            raise Exception(f"API 调用限制: {data['Note']}")
+            if "Error Message" in data:
+                raise Exception(f"API 错误: {data['Error Message']}")
 
-        feed = data.get("feed", [])
-        return feed[:limit]
+            # 只缓存成功响应；限流/错误 body 不会被写入
+            if use_cache:
+                cache_set(BASE_URL, params, data)
 
-    except requests.exceptions.Timeout:
-        raise Exception("请求超时")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"请求失败: {e}")
+            feed = data.get("feed", [])
+            return feed[:limit]
+
+        except requests.exceptions.Timeout:
+            raise Exception("请求超时")
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"请求失败: {e}")
+
+    raise Exception(f"API 调用限制: {last_note}")
+
+
+def fetch_news_groups(
+    groups: List[str],
+    topics: Optional[str] = None,
+    time_from: Optional[str] = None,
+    time_to: Optional[str] = None,
+    sort: str = "LATEST",
+    limit: int = 20,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    多组 tickers 并发查询（一次进程启动代替 N 次冷启动），
+    结果按文章 URL 去重后合并，保持组内原始顺序。
+    """
+    with ThreadPoolExecutor(max_workers=min(len(groups), 8)) as pool:
+        feeds = list(
+            pool.map(
+                lambda g: fetch_news(
+                    tickers=g, topics=topics, time_from=time_from,
+                    time_to=time_to, sort=sort, limit=limit, use_cache=use_cache,
+                ),
+                groups,
+            )
+        )
+
+    seen = set()
+    merged: List[Dict[str, Any]] = []
+    for feed in feeds:
+        for article in feed:
+            url = article.get("url", "")
+            if url and url in seen:
+                continue
+            seen.add(url)
+            merged.append(article)
+    return merged
 
 
 def parse_time_published(time_str: str) -> str:
@@ -204,21 +412,25 @@ def parse_time_published(time_str: str) -> str:
     Returns:
         格式化的时间字符串
     """
+    # 格式固定为 YYYYMMDDTHHMM[SS]：partition 单次扫描 + 按位取数字拼装，
+    # 比 strptime 的格式串解析快数倍；非法输入一律原样返回
+    date_part, sep, time_part = time_str.partition("T")
+    if not sep or len(date_part) != 8 or len(time_part) < 4:
+        return time_str
     try:
-        if "T" in time_str:
-            date_part = time_str.split("T")[0]
-            time_part = time_str.split("T")[1]
-            if len(date_part) == 8:
-                if len(time_part) >= 6:
-                    dt = datetime.strptime(time_str[:15], "%Y%m%dT%H%M%S")
-                elif len(time_part) >= 4:
-                    dt = datetime.strptime(time_str[:13], "%Y%m%dT%H%M")
-                else:
-                    return time_str
-                return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        pass
-    return time_str
+        y, m, d = int(date_part[0:4]), int(date_part[4:6]), int(date_part[6:8])
+        hh, mm = int(time_part[0:2]), int(time_part[2:4])
+        ss = int(time_part[4:6]) if len(time_part) >= 6 else 0
+    except ValueError:
+        return time_str
+    if not (1 <= m <= 12 and 1 <= d <= 31 and hh < 24 and mm < 60 and ss < 60):
+        return time_str
+    return f"{y:04d}-{m:02d}-{d:02d} {hh:02d}:{mm:02d}:{ss:02d}"
+
+
+# 情绪分档阈值与标签：bisect 一次定位代替最多四次 Python 比较
+_SENT_THRESHOLDS = (-0.35, -0.15, 0.15, 0.35)
+_SENT_LABELS = ("强烈看跌", "看跌", "中性", "看涨", "强烈看涨")
 
 
 def format_sentiment(score: float) -> str:
@@ -231,16 +443,7 @@ def format_sentiment(score: float) -> str:
     Returns:
         情绪描述
     """
-    if score >= 0.35:
-        return f"强烈看涨 ({score:+.3f})"
-    elif score >= 0.15:
-        return f"看涨 ({score:+.3f})"
-    elif score >= -0.15:
-        return f"中性 ({score:+.3f})"
-    elif score >= -0.35:
-        return f"看跌 ({score:+.3f})"
-    else:
-        return f"强烈看跌 ({score:+.3f})"
+    return f"{_SENT_LABELS[bisect_right(_SENT_THRESHOLDS, score)]} ({score:+.3f})"
 
 
 def display_articles(articles: List[Dict[str, Any]], verbose: bool = False):
@@ -258,7 +461,10 @@ def display_articles(articles: List[Dict[str, Any]], verbose: bool = False):
     for i, article in enumerate(articles, 1):
         title = article.get("title", "N/A")
         source = article.get("source", "N/A")
-        time_published = parse_time_published(article.get("time_published", ""))
+        # 归一化后的文章已带解析好的时间，优先复用，免得每篇再 strptime 一次
+        time_published = article.get("time_published_readable") or parse_time_published(
+            article.get("time_published", "")
+        )
         summary = article.get("summary", "")
         overall_sentiment = article.get("overall_sentiment_score", 0)
         sentiment_label = article.get("overall_sentiment_label", "N/A")
@@ -296,6 +502,19 @@ def display_articles(articles: List[Dict[str, Any]], verbose: bool = False):
                 print(f"     主题: {topics_str}")
 
 
+def _print_grouped(grouped: List[Dict[str, Any]], verbose: bool = False):
+    """逐组打印 per-ticker 查询结果。"""
+    for item in grouped:
+        ticker = item["ticker"]
+        print(f"📌 {ticker} | 新闻数: {item['news_count']}")
+        if item["avg_overall_sentiment_score"] is not None:
+            print(f"  平均新闻情绪: {item['avg_overall_sentiment_score']:+.3f}")
+        if item["avg_ticker_sentiment_score"] is not None:
+            print(f"  平均个股情绪: {item['avg_ticker_sentiment_score']:+.3f}")
+        display_articles(item["articles"], verbose=verbose)
+        print()
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -313,7 +532,8 @@ def main():
 """
     )
     parser.add_argument("--tickers", type=str, default=None,
-                        help="股票代码，逗号分隔 (例: AAPL,NVDA,CRYPTO:BTC)")
+                        help="股票代码，逗号分隔 (例: AAPL,NVDA,CRYPTO:BTC)；"
+                             "分号分隔多组并发查询 (例: \"AAPL,NVDA;MSFT,GOOG\")")
     parser.add_argument("--topics", type=str, default=None,
                         help="新闻主题，逗号分隔 (例: technology,earnings)")
     parser.add_argument("--days", type=int, default=7,
@@ -344,6 +564,22 @@ def main():
         default=DEFAULT_ALPHA_REQUEST_INTERVAL,
         help="逐股票模式下，每次 API 调用间隔秒数（默认: 0.8，约 75次/分钟）",
     )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=8,
+        help="逐股票模式下的最大并发请求数（默认: 8；设为 1 退回串行）",
+    )
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help="逐股票模式下合并为单次 API 调用再按股票分桶（1 次配额代替 N 次）",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"跳过磁盘缓存强制请求 API（默认缓存 {NEWS_CACHE_TTL} 秒）",
+    )
     parser.add_argument(
         "--output-file",
         type=str,
@@ -380,18 +616,31 @@ def main():
                 raise Exception("逐股票模式必须提供 --tickers，例如 --tickers NVDA,MSFT,AAPL")
 
             per_ticker_limit = max(1, min(args.per_ticker_limit, 50))
-            grouped = fetch_news_per_ticker(
-                tickers=parsed_tickers,
-                per_ticker_limit=per_ticker_limit,
-                topics=args.topics,
-                time_from=time_from,
-                time_to=time_to,
-                sort=args.sort,
-                request_interval=max(args.request_interval, 0.0),
-            )
+            if args.batched:
+                grouped = fetch_news_batched(
+                    tickers=parsed_tickers,
+                    per_ticker_limit=per_ticker_limit,
+                    topics=args.topics,
+                    time_from=time_from,
+                    time_to=time_to,
+                    sort=args.sort,
+                    use_cache=not args.no_cache,
+                )
+            else:
+                grouped = fetch_news_per_ticker(
+                    tickers=parsed_tickers,
+                    per_ticker_limit=per_ticker_limit,
+                    topics=args.topics,
+                    time_from=time_from,
+                    time_to=time_to,
+                    sort=args.sort,
+                    request_interval=max(args.request_interval, 0.0),
+                    max_concurrent=max(args.max_concurrent, 1),
+                    use_cache=not args.no_cache,
+                )
 
             payload = {
-                "mode": "per_ticker",
+                "mode": "per_ticker_batched" if args.batched else "per_ticker",
                 "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "days": args.days,
                 "sort": args.sort,
@@ -408,25 +657,35 @@ def main():
 
             if args.json:
                 print(json.dumps(payload, indent=2, ensure_ascii=False))
-            else:
-                for item in grouped:
-                    ticker = item["ticker"]
-                    print(f"📌 {ticker} | 新闻数: {item['news_count']}")
-                    if item["avg_overall_sentiment_score"] is not None:
-                        print(f"  平均新闻情绪: {item['avg_overall_sentiment_score']:+.3f}")
-                    if item["avg_ticker_sentiment_score"] is not None:
-                        print(f"  平均个股情绪: {item['avg_ticker_sentiment_score']:+.3f}")
-                    display_articles(item["articles"], verbose=args.verbose)
-                    print()
+            elif not args.output_file:
+                # 结果已落盘时跳过逐条终端格式化，管道场景省下纯打印开销
+                _print_grouped(grouped, verbose=args.verbose)
         else:
-            articles = fetch_news(
-                tickers=args.tickers,
-                topics=args.topics,
-                time_from=time_from,
-                time_to=time_to,
-                sort=args.sort,
-                limit=min(args.limit, 50),
+            ticker_groups = (
+                [g.strip() for g in args.tickers.split(";") if g.strip()]
+                if args.tickers
+                else []
             )
+            if len(ticker_groups) > 1:
+                articles = fetch_news_groups(
+                    ticker_groups,
+                    topics=args.topics,
+                    time_from=time_from,
+                    time_to=time_to,
+                    sort=args.sort,
+                    limit=min(args.limit, 50),
+                    use_cache=not args.no_cache,
+                )
+            else:
+                articles = fetch_news(
+                    tickers=ticker_groups[0] if ticker_groups else args.tickers,
+                    topics=args.topics,
+                    time_from=time_from,
+                    time_to=time_to,
+                    sort=args.sort,
+                    limit=min(args.limit, 50),
+                    use_cache=not args.no_cache,
+                )
             if args.output_file:
                 out_path = Path(args.output_file)
                 out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -435,7 +694,7 @@ def main():
 
             if args.json:
                 print(json.dumps(articles, indent=2, ensure_ascii=False))
-            else:
+            elif not args.output_file:
                 print(f"找到 {len(articles)} 篇新闻:")
                 display_articles(articles, verbose=args.verbose)
 
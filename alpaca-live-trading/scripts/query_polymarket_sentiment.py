@@ -8,13 +8,46 @@
 """
 
 import sys
+import io
 import json
 import argparse
+import re
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# outcomePrices 恒为 '["0.xx","0.yy",...]'，只取首价（Yes）时
+# 正则截取比完整 JSON 解析快一个量级
+_YES_RE = re.compile(r'^\["([^"]+)"')
+
+
+def _yes_price(raw: Any) -> float:
+    """从 outcomePrices（列表或其 JSON 字符串形式）提取 Yes 价格。"""
+    if isinstance(raw, list):
+        if raw:
+            try:
+                return float(raw[0])
+            except (TypeError, ValueError):
+                return 0.0
+        return 0.0
+    if isinstance(raw, str):
+        m = _YES_RE.match(raw)
+        if m:
+            try:
+                return float(m.group(1))
+            except ValueError:
+                return 0.0
+    return 0.0
+
 
 class PolymarketClient:
     """Polymarket API 客户端"""
@@ -24,6 +57,11 @@ class PolymarketClient:
     def __init__(self, timeout: int = 30):
         self.timeout = timeout
         self.session = requests.Session()
+        # 显式配置连接池：keep-alive 复用 TLS 连接，多请求省去握手开销
+        self.session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16),
+        )
         self.session.headers.update({
             "Accept": "application/json",
             "User-Agent": "AI-Trader/1.0"
@@ -35,7 +73,8 @@ class PolymarketClient:
         try:
             response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            return response.json()
+            # events 列表可达数百 KB，orjson 解码比 response.json() 快 2-5 倍
+            return _loads(response.content)
         except requests.exceptions.RequestException as e:
             raise Exception(f"API 请求失败: {e}")
     
@@ -67,55 +106,59 @@ def get_financial_sentiment() -> str:
         ("commodities", "Commodities (大宗商品)", 5),
     ]
     
-    output_lines = [
-        "📊 **Polymarket 金融市场实时情绪指标**",
-        f"数据时间: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}",
-        ""
-    ]
-    
-    for tag_slug, category_name, limit in categories:
+    # 单一可扩展缓冲区代替逐行 append 的列表，最后一次性取值
+    buf = io.StringIO()
+    w = buf.write
+    w("📊 **Polymarket 金融市场实时情绪指标**\n")
+    w(f"数据时间: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+    w("\n")
+    
+    # 5 个分类的请求互相独立，并发发出后按原顺序格式化，
+    # 网络耗时从 5 次串行 RTT 降为约 1 次
+    def _fetch_category(category):
+        tag_slug, _, limit = category
         try:
-            events = client.fetch("/events", {
+            return client.fetch("/events", {
                 "limit": limit,
                 "closed": "false",
                 "tag_slug": tag_slug,
                 "order": "volume24hr",
                 "ascending": "false"
             })
-            
-            if not events:
-                continue
-            
-            output_lines.append(f"## {category_name}")
-            
-            for i, event in enumerate(events[:limit], 1):
-                title = event.get("title", "Unknown")
-                vol24 = event.get("volume24hr", 0)
-                
-                # 获取第一个市场的价格
-                markets = event.get("markets", [])
-                if markets:
-                    m = markets[0]
-                    prices = m.get("outcomePrices", [])
-                    if isinstance(prices, str):
-                        try:
-                            prices = json.loads(prices)
-                        except:
-                            prices = []
-                    
-                    yes_pct = float(prices[0]) * 100 if prices else 0
-                    output_lines.append(f"{i}. **{title}** | Yes: {yes_pct:.1f}% | 24h Vol: ${vol24:,.0f}")
-                else:
-                    output_lines.append(f"{i}. **{title}** | 24h Vol: ${vol24:,.0f}")
-            
-            output_lines.append("")
-            
         except Exception as e:
-            output_lines.append(f"## {category_name}")
-            output_lines.append(f"  ⚠️ 获取失败: {e}")
-            output_lines.append("")
-    
-    return "\n".join(output_lines)
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(categories)) as pool:
+        fetched = list(pool.map(_fetch_category, categories))
+
+    for (tag_slug, category_name, limit), events in zip(categories, fetched):
+        if isinstance(events, Exception):
+            w(f"## {category_name}\n")
+            w(f"  ⚠️ 获取失败: {events}\n")
+            w("\n")
+            continue
+
+        if not events:
+            continue
+
+        w(f"## {category_name}\n")
+
+        for i, event in enumerate(events[:limit], 1):
+            title = event.get("title", "Unknown")
+            vol24 = event.get("volume24hr", 0)
+
+            # 获取第一个市场的价格
+            markets = event.get("markets", [])
+            if markets:
+                yes_pct = _yes_price(markets[0].get("outcomePrices", [])) * 100
+                w(f"{i}. **{title}** | Yes: {yes_pct:.1f}% | 24h Vol: ${vol24:,.0f}\n")
+            else:
+                w(f"{i}. **{title}** | 24h Vol: ${vol24:,.0f}\n")
+
+        w("\n")
+
+    # 每行都带换行符写入，去掉末尾多出的一个即与原 join 输出一致
+    return buf.getvalue()[:-1]
 
 
 def get_trending_markets(limit: int = 10) -> str:
@@ -132,39 +175,32 @@ def get_trending_markets(limit: int = 10) -> str:
     
     events = client.get_trending(limit=limit)
     
-    output_lines = [
-        "🔥 **Polymarket 热门市场**",
-        f"数据时间: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}",
-        f"显示前 {len(events)} 个最活跃市场（按24h交易量排序）",
-        ""
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    w("🔥 **Polymarket 热门市场**\n")
+    w(f"数据时间: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+    w(f"显示前 {len(events)} 个最活跃市场（按24h交易量排序）\n")
+    w("\n")
     
     for i, event in enumerate(events, 1):
         title = event.get("title", "Unknown")
         vol24 = event.get("volume24hr", 0)
         total_vol = event.get("volume", 0)
         
-        output_lines.append(f"### {i}. {title}")
-        output_lines.append(f"24h 交易量: ${vol24:,.0f} | 总交易量: ${total_vol:,.0f}")
+        w(f"### {i}. {title}\n")
+        w(f"24h 交易量: ${vol24:,.0f} | 总交易量: ${total_vol:,.0f}\n")
         
         # 显示市场详情
         markets = event.get("markets", [])
         for m in markets[:3]:  # 最多显示3个子市场
             question = m.get("question", "")
-            prices = m.get("outcomePrices", [])
-            if isinstance(prices, str):
-                try:
-                    prices = json.loads(prices)
-                except:
-                    prices = []
-            
-            yes_pct = float(prices[0]) * 100 if prices else 0
-            output_lines.append(f"  • {question}")
-            output_lines.append(f"    Yes: {yes_pct:.1f}%")
+            yes_pct = _yes_price(m.get("outcomePrices", [])) * 100
+            w(f"  • {question}\n")
+            w(f"    Yes: {yes_pct:.1f}%\n")
         
-        output_lines.append("")
+        w("\n")
     
-    return "\n".join(output_lines)
+    return buf.getvalue()[:-1]
 
 
 def main():
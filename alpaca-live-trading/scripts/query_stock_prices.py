@@ -8,7 +8,13 @@
 """
 
 import sys
+import argparse
+import hashlib
 import json
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List
@@ -23,6 +29,16 @@ except ImportError:
     TVSCREENER_AVAILABLE = False
     print("⚠️ tvscreener 未安装，请运行: pip install -U tvscreener")
 
+try:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        # C 序列化器直接产出 UTF-8 字节，比 json.dumps + encode 快 3-5 倍
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
 # 默认查询: NASDAQ 100 + QQQ (共 101)
 DEFAULT_SYMBOLS = [
     "NVDA", "MSFT", "AAPL", "GOOG", "GOOGL", "AMZN", "META", "AVGO", "TSLA", "NFLX",
@@ -57,7 +73,22 @@ def _normalize_symbol(symbol: str) -> str:
     return symbol.strip().upper()
 
 
+def _is_null(value: Any) -> bool:
+    # 覆盖 None 与 NaN（NaN 为真值，`or 0` 兜不住）
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _num(value: Any, default: float = 0.0) -> float:
+    if _is_null(value):
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
 def _resolve_technical_stock_fields():
+    # StockField 枚举在进程内不变，解析结果在下方固化为模块常量
     fields = []
     resolved_keys = {}
     for key, field_name in TECHNICAL_FIELDS.items():
@@ -69,71 +100,143 @@ def _resolve_technical_stock_fields():
                 resolved_keys[key] = str(raw_value[0])
             else:
                 resolved_keys[key] = str(raw_value)
-    return fields, resolved_keys
+    return tuple(fields), resolved_keys
+
+
+# 导入期解析一次，逐符号热路径上直接读常量，
+# 不再每次调用做 getattr/isinstance/str 换算
+if TVSCREENER_AVAILABLE:
+    _TECH_FIELDS, _TECH_COL_MAP = _resolve_technical_stock_fields()
+else:
+    _TECH_FIELDS, _TECH_COL_MAP = (), {}
+
+
+# 快照磁盘缓存 TTL（秒）：调度器一分钟内多次调用时免去重复全市场拉取
+_SNAPSHOT_TTL = float(os.environ.get("TV_SNAPSHOT_TTL", "60"))
+
+
+def _snapshot_cache_path() -> Path:
+    cache_dir = Path(__file__).resolve().parent.parent / "data" / ".cache"
+    key = hashlib.md5(
+        repr(("AMERICA", tuple(sorted(TECHNICAL_FIELDS.values())))).encode()
+    ).hexdigest()
+    return cache_dir / f"tv_snapshot_{key}.pkl"
 
 
 def _load_market_snapshot() -> Any:
     """
-    拉取美国市场行情快照，用于本地筛选。
+    拉取美国市场行情快照，用于本地筛选（带短 TTL 磁盘缓存）。
+
+    TTL 默认 60 秒，可用 TV_SNAPSHOT_TTL 环境变量调整；
+    cron 每几分钟跑一次流水线时，同一分钟内的重复调用直接命中磁盘缓存。
     """
     if not TVSCREENER_AVAILABLE:
         return None
 
+    cache_path = _snapshot_cache_path()
+    try:
+        if time.time() - cache_path.stat().st_mtime < _SNAPSHOT_TTL:
+            return pickle.loads(cache_path.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
     ss = StockScreener()
     ss.set_markets(Market.AMERICA)
     ss.set_range(0, 5000)
-    tech_fields, _ = _resolve_technical_stock_fields()
     base_fields = [
         StockField.NAME,
         StockField.PRICE,
         StockField.CHANGE_PERCENT,
         StockField.VOLUME,
     ]
-    ss.select(*(base_fields + tech_fields))
-    return ss.get()
+    ss.select(*base_fields, *_TECH_FIELDS)
+    snapshot = ss.get()
+
+    # 原子写缓存；只读环境静默跳过
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
 
+    return snapshot
 
-def get_quote(symbol: str, snapshot) -> Dict[str, Any]:
+
+def build_symbol_index(snapshot) -> Dict[str, Dict[str, Any]]:
+    """
+    把行情快照一次性转成 symbol/name -> 行 的哈希索引。
+
+    逐符号查询从整列布尔扫描（O(行数) 且每次分配临时 Series）
+    降为 O(1) 字典查找；setdefault 保持与原扫描一致的首行命中语义。
+    to_dict("records") 之后 pandas 完全退出逐符号热路径，
+    行数据都是普通 dict，按代码全称、冒号后裸代码、名称三类键索引。
+    Symbol 列保持 object dtype：已无布尔掩码比较，转 category 只会
+    平添一次 astype 开销。
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    if snapshot is None:
+        return index
+
+    has_symbol = "Symbol" in snapshot.columns
+    has_name = "Name" in snapshot.columns
+    rows = snapshot.to_dict("records")
+    # 大写键用整列向量化 .str.upper() 一次算好，建索引循环里不再逐行调 str.upper
+    symbols_upper = (
+        snapshot["Symbol"].astype(str).str.upper().tolist() if has_symbol else [""] * len(rows)
+    )
+    names_upper = (
+        snapshot["Name"].astype(str).str.upper().tolist() if has_name else [""] * len(rows)
+    )
+    for row, sym, name in zip(rows, symbols_upper, names_upper):
+        if sym and sym != "NAN":
+            index.setdefault(sym, row)
+            # 形如 NASDAQ:NVDA 时再按裸代码建一份键，兼容两种写法
+            index.setdefault(sym.rsplit(":", 1)[-1], row)
+        if name and name != "NAN":
+            index.setdefault(name, row)
+    return index
+
+
+def get_quote(symbol: str, symbol_index: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     """
     获取股票的实时报价（TradingView tvscreener）
 
     Args:
         symbol: 股票代码（例如 NVDA 或 NASDAQ:NVDA）
-        snapshot: tvscreener DataFrame
+        symbol_index: build_symbol_index 生成的哈希索引
 
     Returns:
         包含报价信息的字典
     """
-    if snapshot is None:
+    if not symbol_index:
         return {"error": "tvscreener 未就绪"}
 
-    token = symbol.split(":")[-1].upper()
-    symbol_col = "Symbol" if "Symbol" in snapshot.columns else None
-    row = snapshot[snapshot[symbol_col] == symbol] if symbol_col else snapshot.iloc[0:0]
-    if row.empty and symbol_col:
-        row = snapshot[snapshot[symbol_col].astype(str).str.upper() == token]
-    if row.empty and symbol_col:
-        row = snapshot[snapshot[symbol_col].astype(str).str.upper().str.endswith(f":{token}")]
-    if row.empty and "Name" in snapshot.columns:
-        row = snapshot[snapshot["Name"].astype(str).str.upper() == token]
-
-    if row.empty:
+    token = symbol.rsplit(":", 1)[-1].upper()
+    payload = symbol_index.get(symbol.upper()) or symbol_index.get(token)
+    if payload is None:
         return {"error": "无数据"}
 
-    payload = row.iloc[0].to_dict()
+    # 大小写兼容表只建一次，十余个指标列的取值都是 O(1)，
+    # 免去每列一趟 str.lower() 线性扫描
+    payload_lower = {str(k).lower(): v for k, v in payload.items()}
 
     def _lookup(col_name: str):
         if col_name in payload:
-            return payload.get(col_name)
-        # 兼容大小写差异
-        for k, v in payload.items():
-            if str(k).lower() == str(col_name).lower():
-                return v
-        return None
+            return payload[col_name]
+        return payload_lower.get(str(col_name).lower())
 
-    _, tech_col_map = _resolve_technical_stock_fields()
-    price = float(_lookup("Price") or 0)
-    change_pct = float(_lookup("Change %") or 0)
+    tech_col_map = _TECH_COL_MAP
+    # 退市/停牌行 Price 为空或 NaN，提前返回错误而不是产出 0.0 假行情
+    raw_price = _lookup("Price")
+    if _is_null(raw_price):
+        return {"error": "无价格"}
+    price = float(raw_price)
+    change_pct = _num(_lookup("Change %"))
     change = price * change_pct / 100 if price else 0.0
 
     return {
@@ -141,7 +244,7 @@ def get_quote(symbol: str, snapshot) -> Dict[str, Any]:
         "price": price,
         "change": change,
         "change_pct": change_pct,
-        "volume": float(_lookup("Volume") or 0),
+        "volume": _num(_lookup("Volume")),
         "technical": {
             "rsi_14": _lookup(tech_col_map.get("rsi_14", "")),
             "macd": _lookup(tech_col_map.get("macd", "")),
@@ -167,37 +270,52 @@ def write_latest_snapshot(results: List[Dict[str, Any]], symbols: List[str]) ->
         "symbols": symbols,
         "results": results,
     }
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    out_path.write_bytes(_dumps_pretty(payload))
 
 
 def main():
     """主函数"""
     # 解析命令行参数
-    symbols = sys.argv[1:] if len(sys.argv) > 1 else DEFAULT_SYMBOLS
-    
+    parser = argparse.ArgumentParser(description="查询股票实时价格 (TradingView tvscreener)")
+    parser.add_argument("symbols", nargs="*", default=DEFAULT_SYMBOLS,
+                        help="股票代码列表 (默认: NASDAQ 100 + QQQ)")
+    args = parser.parse_args()
+    symbols = args.symbols or DEFAULT_SYMBOLS
+    # 规整大小写并保序去重，重复传参不再查询/展示两遍
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+    # 网络快照先在后台线程起跑，打印头部信息的时间与首个 RTT 重叠
+    prefetch = ThreadPoolExecutor(max_workers=1)
+    snapshot_future = prefetch.submit(_load_market_snapshot)
+
     print("📈 股票实时价格查询")
     print("=" * 50)
     print(f"数据来源: TradingView tvscreener")
     print(f"查询时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"查询股票: {', '.join(symbols)}")
     print("=" * 50)
-    
+
     if not TVSCREENER_AVAILABLE:
         sys.exit(1)
-    
+
     print("\n获取报价数据...\n")
-    
+
+    snapshot = snapshot_future.result()
+    prefetch.shutdown()
+    symbol_index = build_symbol_index(snapshot)
+
+    # 索引建好后逐符号提取只是内存哈希查找（微秒级），
+    # 单趟批量循环即可，线程池的调度开销反而更贵
     results = []
-    snapshot = _load_market_snapshot()
     for symbol in symbols:
+        result = get_quote(symbol, symbol_index)
         print(f"  获取 {symbol}...", end=" ")
-        result = get_quote(symbol, snapshot)
         if "error" in result:
             print(f"❌ {result['error']}")
         else:
             print("✓")
             results.append(result)
-    
+
     if results:
         print("\n" + "=" * 50)
         print("📊 股票价格汇总")
@@ -15,9 +15,39 @@
 from __future__ import annotations
 
 import argparse
+import heapq
+import io
 import json
+import os
+import struct
+import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# 倒序读取 JSONL 尾部时的块大小
+_TAIL_BLOCK = 64 * 1024
+
+# 超过该大小的 jsonl 走 pandas 的 C 解析器整体读入
+_PANDAS_JSONL_MIN_BYTES = 1024 * 1024
+
 
 def resolve_skill_data_dir() -> Path:
     # skills/alpaca-live-trading/scripts -> skills/alpaca-live-trading/data
@@ -27,6 +57,21 @@ def resolve_skill_data_dir() -> Path:
 def read_jsonl(path: Path) -> List[Dict[str, Any]]:
     if not path.exists():
         return []
+    if pd is not None:
+        try:
+            if path.stat().st_size > _PANDAS_JSONL_MIN_BYTES:
+                # 大文件用 read_json(lines=True) 一次性 C 解析，
+                # 比逐行 json.loads 快 2-3 倍；convert_dates=False
+                # 保持 date 等字段原样字符串
+                frame = pd.read_json(path, lines=True, convert_dates=False)
+                # 异构行并表会补出 NaN 单元格，剔除以保持与逐行解析一致的键集合
+                return [
+                    {k: v for k, v in row.items() if not (isinstance(v, float) and v != v)}
+                    for row in frame.to_dict("records")
+                ]
+        except (OSError, ValueError):
+            # 含损坏行时退回逐行解析（保留跳过坏行的语义）
+            pass
     rows: List[Dict[str, Any]] = []
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
@@ -34,21 +79,136 @@ def read_jsonl(path: Path) -> List[Dict[str, Any]]:
             if not line:
                 continue
             try:
-                rows.append(json.loads(line))
+                rows.append(_loads(line))
             except Exception:
                 continue
     return rows
 
 
-def build_balance_map(balance_rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    # 以 order_id 为主键，便于与 position 记录对齐
-    mapping: Dict[str, Dict[str, Any]] = {}
-    for row in balance_rows:
-        trade = row.get("trade", {})
-        order_id = str(trade.get("order_id", "")).strip()
-        if order_id:
-            mapping[order_id] = row
-    return mapping
+def read_jsonl_tail(path: Path, n: int) -> List[Dict[str, Any]]:
+    """
+    只解析文件末尾约 n 条记录（保持文件内顺序）。
+
+    从尾部按 64KB 块倒序读取，收集完整行即停，长账户历史下
+    免去整文件读入与全量 JSON 解析。损坏行与空行照旧跳过。
+    """
+    if n <= 0 or not path.exists():
+        return []
+
+    rows_rev: List[Dict[str, Any]] = []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0 and len(rows_rev) < n:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            # 块边界可能截断最前一行，留到下一轮与前块拼接
+            tail = lines.pop(0) if pos > 0 else b""
+            for line in reversed(lines):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows_rev.append(_loads(line))
+                except Exception:
+                    continue
+                if len(rows_rev) >= n:
+                    break
+
+    rows_rev.reverse()
+    return rows_rev
+
+
+def _index_path(path: Path) -> Path:
+    # position.jsonl -> position.idx（与 .lastid 侧车文件同一风格）
+    return path.with_suffix(".idx")
+
+
+def ensure_index(path: Path) -> Optional[Path]:
+    """
+    维护行尾字节偏移的侧车索引（小端 uint64，追加写）。
+
+    索引第 i 项是第 i 行换行符之后的文件偏移，因此最后一项就是
+    已索引到的位置；增量更新只需从该位置继续扫描新追加的行。
+    文件被截断或重写（偏移超出文件大小）时废弃重建。
+    失败（如只读目录）返回 None，调用方回退到倒序块读取。
+    """
+    idx_path = _index_path(path)
+    try:
+        size = path.stat().st_size
+        start = 0
+        if idx_path.exists() and idx_path.stat().st_size >= 8:
+            with open(idx_path, "rb") as f:
+                f.seek(-8, os.SEEK_END)
+                start = struct.unpack("<Q", f.read(8))[0]
+            if start > size:
+                idx_path.unlink()
+                start = 0
+        if start >= size:
+            return idx_path
+
+        offsets: List[int] = []
+        with open(path, "rb") as f:
+            f.seek(start)
+            pos = start
+            for line in f:
+                pos += len(line)
+                # 尾部未写完的半行不入索引，下次补齐后再扫
+                if line.endswith(b"\n"):
+                    offsets.append(pos)
+        if offsets:
+            with open(idx_path, "ab") as f:
+                f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        return idx_path
+    except OSError:
+        return None
+
+
+def read_jsonl_tail_indexed(path: Path, n: int) -> List[Dict[str, Any]]:
+    """
+    借助 .idx 侧车索引 O(1) 定位最后 n 行的起点后直接 seek 读取。
+
+    索引不可用（建索引失败、索引为空）时回退 read_jsonl_tail。
+    """
+    if n <= 0 or not path.exists():
+        return []
+
+    idx_path = ensure_index(path)
+    if idx_path is None:
+        return read_jsonl_tail(path, n)
+    try:
+        count = idx_path.stat().st_size // 8
+        if count == 0:
+            return read_jsonl_tail(path, n)
+        if n >= count:
+            start = 0
+        else:
+            with open(idx_path, "rb") as f:
+                f.seek((count - n - 1) * 8)
+                start = struct.unpack("<Q", f.read(8))[0]
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+    except OSError:
+        return read_jsonl_tail(path, n)
+
+    rows: List[Dict[str, Any]] = []
+    for line in data.split(b"\n"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rows.append(_loads(line))
+        except Exception:
+            continue
+    if len(rows) < n and start > 0:
+        # 窗口内混有损坏/空行导致记录数不足，退回倒序块读取补齐
+        return read_jsonl_tail(path, n)
+    return rows[-n:]
 
 
 def summarize_positions(position_snapshot: Dict[str, Any], top_n: int = 8) -> str:
@@ -94,34 +254,49 @@ def _record_time_key(row: Dict[str, Any]) -> str:
 def unified_records(
     position_rows: List[Dict[str, Any]],
     balance_rows: List[Dict[str, Any]],
+    limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-    balance_map = build_balance_map(balance_rows)
+    # 一趟遍历同时建 order_id 主键映射与回退键映射，
+    # 并把取好的键暂存下来，孤儿补录循环无需再取 trade/重算键
+    balance_map: Dict[str, Dict[str, Any]] = {}
     fallback_map: Dict[str, Dict[str, Any]] = {}
+    balance_keyed: List[tuple] = []
     for b in balance_rows:
         trade = b.get("trade", {})
+        order_id = str(trade.get("order_id", "")).strip()
         k = _fallback_key(
             b.get("date"),
             trade.get("action"),
             trade.get("symbol"),
             trade.get("qty"),
         )
+        if order_id:
+            balance_map[order_id] = b
         fallback_map[k] = b
+        balance_keyed.append((order_id, k, trade, b))
 
     merged: List[Dict[str, Any]] = []
+    # 边合并边登记已见键，孤儿补录免去对 merged 的二次遍历与键重算
+    existing_order_ids: set = set()
+    existing_fallback_keys: set = set()
 
     for p in position_rows:
         action = p.get("this_action", {})
         order_id = str(action.get("order_id", "")).strip()
+        k = _fallback_key(
+            p.get("date"),
+            action.get("action"),
+            action.get("symbol"),
+            action.get("amount"),
+        )
         b = balance_map.get(order_id, {})
         if not b:
-            k = _fallback_key(
-                p.get("date"),
-                action.get("action"),
-                action.get("symbol"),
-                action.get("amount"),
-            )
             b = fallback_map.get(k, {})
 
+        if order_id:
+            existing_order_ids.add(order_id)
+        existing_fallback_keys.add(k)
+
         account = b.get("account", {})
         merged.append(
             {
@@ -137,25 +312,14 @@ def unified_records(
                 "cash": account.get("cash"),
                 "equity": account.get("equity"),
                 "portfolio_value": account.get("portfolio_value"),
-                "positions_summary": summarize_positions(p.get("positions", {})),
+                # 汇总串延后到截断之后再算，被 --limit 裁掉的行不做字符串拼装
+                "positions_raw": p.get("positions", {}),
                 "has_balance_snapshot": bool(b),
             }
         )
 
     # 若存在仅 balance 没有 position 的历史记录，也补进去
-    existing_order_ids = {str(x.get("order_id", "")).strip() for x in merged if x.get("order_id")}
-    existing_fallback_keys = {
-        _fallback_key(x.get("date"), x.get("action"), x.get("symbol"), x.get("amount")) for x in merged
-    }
-    for b in balance_rows:
-        trade = b.get("trade", {})
-        order_id = str(trade.get("order_id", "")).strip()
-        fallback_k = _fallback_key(
-            b.get("date"),
-            trade.get("action"),
-            trade.get("symbol"),
-            trade.get("qty"),
-        )
+    for order_id, fallback_k, trade, b in balance_keyed:
         if (order_id and order_id in existing_order_ids) or fallback_k in existing_fallback_keys:
             continue
         account = b.get("account", {})
@@ -182,37 +346,67 @@ def unified_records(
     def sort_key(x: Dict[str, Any]):
         return (_record_time_key(x), int(x.get("id") or 0))
 
+    if limit is not None and 0 < limit < len(merged):
+        # 只要尾部 limit 条时堆选代替整表排序：O(n log limit)。
+        # 键只算一趟；原始下标作并列裁决，与稳定排序取尾等价
+        top = heapq.nlargest(
+            limit,
+            ((sort_key(x), i, x) for i, x in enumerate(merged)),
+        )
+        top.reverse()
+        return [x for _, _, x in top]
+
     merged.sort(key=sort_key)
     return merged
 
 
+def finalize_positions_summary(rows: List[Dict[str, Any]]) -> None:
+    """
+    就地把 positions_raw 换算成 positions_summary。
+
+    在 main 截断到 --limit 条之后调用，持仓汇总串只为最终展示
+    的行生成；来自 balance 快照的补录行已带固定汇总串，原样保留。
+    """
+    for row in rows:
+        raw = row.pop("positions_raw", None)
+        if "positions_summary" not in row:
+            row["positions_summary"] = summarize_positions(raw or {})
+
+
 def print_human_readable(rows: List[Dict[str, Any]], limit: int) -> None:
-    print("📚 Alpaca 交易记录（统一视图）")
-    print("=" * 80)
-    print(f"显示最近: {limit} 条")
-    print("=" * 80)
+    # 全部输出先写进内存缓冲，最后一次 write 落到 stdout：
+    # 每行 print 各触发一次 write 系统调用，记录多时开销可观
+    buf = io.StringIO()
+    w = buf.write
+    w("📚 Alpaca 交易记录（统一视图）\n")
+    w("=" * 80 + "\n")
+    w(f"显示最近: {limit} 条\n")
+    w("=" * 80 + "\n")
 
     if not rows:
-        print("暂无记录。")
+        w("暂无记录。\n")
+        sys.stdout.write(buf.getvalue())
         return
 
     for idx, row in enumerate(rows, 1):
-        print(f"[{idx}] {row.get('date')} | id={row.get('id')}")
+        w(f"[{idx}] {row.get('date')} | id={row.get('id')}\n")
         if row.get("timestamp_et") or row.get("timestamp_utc"):
-            print(f"  时间: ET={row.get('timestamp_et') or 'N/A'} | UTC={row.get('timestamp_utc') or 'N/A'}")
-        print(
+            w(f"  时间: ET={row.get('timestamp_et') or 'N/A'} | UTC={row.get('timestamp_utc') or 'N/A'}\n")
+        w(
             f"  交易: {str(row.get('action', '')).upper()} "
-            f"{row.get('symbol')} x {row.get('amount')} @ {format_currency(row.get('price'))}"
+            f"{row.get('symbol')} x {row.get('amount')} @ {format_currency(row.get('price'))}\n"
         )
-        print(f"  订单: {row.get('order_id') or 'N/A'}")
-        print(
+        w(f"  订单: {row.get('order_id') or 'N/A'}\n")
+        w(
             f"  账户: cash={format_currency(row.get('cash'))}, "
             f"equity={format_currency(row.get('equity'))}, "
-            f"portfolio={format_currency(row.get('portfolio_value'))}"
+            f"portfolio={format_currency(row.get('portfolio_value'))}\n"
         )
-        print(f"  持仓: {row.get('positions_summary')}")
-        print(f"  balance快照: {'是' if row.get('has_balance_snapshot') else '否'}")
-        print("-" * 80)
+        w(f"  持仓: {row.get('positions_summary')}\n")
+        w(f"  balance快照: {'是' if row.get('has_balance_snapshot') else '否'}\n")
+        w("-" * 80 + "\n")
+
+    sys.stdout.write(buf.getvalue())
 
 
 def main() -> None:
@@ -229,26 +423,29 @@ def main() -> None:
     position_file = base / "position" / "position.jsonl"
     balance_file = base / "balance" / "balance.jsonl"
 
-    position_rows = read_jsonl(position_file)
-    balance_rows = read_jsonl(balance_file)
-    merged = unified_records(position_rows, balance_rows)
-    merged = merged[-args.limit:]
+    if args.limit <= 1000:
+        # 展示尾部 N 条时只解析尾部（多读一倍以覆盖两文件的错位记录）
+        tail_budget = args.limit * 2
+        position_rows = read_jsonl_tail_indexed(position_file, tail_budget)
+        balance_rows = read_jsonl_tail_indexed(balance_file, tail_budget)
+    else:
+        position_rows = read_jsonl(position_file)
+        balance_rows = read_jsonl(balance_file)
+    merged = unified_records(position_rows, balance_rows, limit=args.limit)
+    finalize_positions_summary(merged)
 
     if args.json:
-        print(
-            json.dumps(
-                {
-                    "records_dir": str(base),
-                    "limit": args.limit,
-                    "position_file": str(position_file),
-                    "balance_file": str(balance_file),
-                    "count": len(merged),
-                    "records": merged,
-                },
-                ensure_ascii=False,
-                indent=2,
-            )
-        )
+        payload = {
+            "records_dir": str(base),
+            "limit": args.limit,
+            "position_file": str(position_file),
+            "balance_file": str(balance_file),
+            "count": len(merged),
+            "records": merged,
+        }
+        # 直接写 UTF-8 字节到 stdout，省一次 str 中转编码
+        sys.stdout.buffer.write(_dumps_pretty(payload))
+        sys.stdout.buffer.write(b"\n")
         return
 
     print_human_readable(merged, args.limit)
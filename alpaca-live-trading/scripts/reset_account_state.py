@@ -18,6 +18,7 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def resolve_skill_data_dir() -> Path:
@@ -26,10 +27,11 @@ def resolve_skill_data_dir() -> Path:
 
 
 def remove_if_exists(path: Path) -> bool:
-    if path.exists():
-        path.unlink()
-        return True
-    return False
+    # missing_ok 让删除本身单系统调用完成且无 exists/unlink 间隙的竞态；
+    # 返回值只用于"已删除/不存在"的提示文案
+    existed = path.is_file()
+    path.unlink(missing_ok=True)
+    return existed
 
 
 def main() -> None:
@@ -38,24 +40,35 @@ def main() -> None:
     args = parser.parse_args()
 
     base = resolve_skill_data_dir()
-    position_file = base / "position" / "position.jsonl"
-    balance_file = base / "balance" / "balance.jsonl"
+    # 待清理文件统一列在这里，后续新增记录文件（分品种持仓、归档等）只需追加。
+    # 侧车文件（.lastid 计数器 / .idx 行索引 / .lasthash 去重哈希）必须与主
+    # jsonl 同生同灭：只删主文件会让下次交易从陈旧计数器续号而非从 1 重新开始
+    targets = [
+        base / "position" / "position.jsonl",
+        base / "position" / "position.lastid",
+        base / "position" / "position.idx",
+        base / "balance" / "balance.jsonl",
+        base / "balance" / "balance.lasthash",
+        base / "balance" / "balance.idx",
+    ]
 
     if not args.yes:
         print("⚠️ 即将删除以下本地记录文件：")
-        print(f"  - {position_file}")
-        print(f"  - {balance_file}")
+        for path in targets:
+            print(f"  - {path}")
         confirm = input("确认执行？输入 yes 继续: ").strip().lower()
         if confirm != "yes":
             print("已取消。")
             return
 
-    deleted_position = remove_if_exists(position_file)
-    deleted_balance = remove_if_exists(balance_file)
+    # 删除互相独立，批量提交到线程池并发 unlink，文件增多后耗时不随数量线性涨
+    with ThreadPoolExecutor(max_workers=max(1, len(targets))) as pool:
+        deleted = list(pool.map(remove_if_exists, targets))
 
+    width = max(len(p.name) for p in targets)
     print("✅ 重置完成（本地记录）")
-    print(f"  position.jsonl: {'已删除' if deleted_position else '不存在'}")
-    print(f"  balance.jsonl : {'已删除' if deleted_balance else '不存在'}")
+    for path, was_deleted in zip(targets, deleted):
+        print(f"  {path.name:<{width}}: {'已删除' if was_deleted else '不存在'}")
     print("  下次交易会自动重新创建文件。")
 
 
@@ -15,9 +15,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -26,30 +28,39 @@ from typing import Any, Dict, List, Optional, Tuple
 SCRIPT_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(SCRIPT_DIR))
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        # 输出含全部基本面/新闻/报价，常达数 MB；orjson 直接产出
+        # UTF-8 字节，比 json.dumps + encode 快 3-10 倍
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+except ImportError:
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
 from _config import get_risk_config, get_strategy_config, load_config
 from order_builder import build_trade_plan
-from query_fundamentals import fetch_fundamentals_for_symbol
+from query_fundamentals import _RateLimiter, fetch_fundamentals_for_symbol
 from query_market_news import fetch_news_per_ticker
 from query_polymarket_sentiment import get_financial_sentiment
-from query_stock_prices import DEFAULT_SYMBOLS, _load_market_snapshot, get_quote
+from query_stock_prices import DEFAULT_SYMBOLS, _load_market_snapshot, build_symbol_index, get_quote
+from query_trade_records import read_jsonl_tail
 from risk_guard import apply_risk_guard
 from strategy_engine import run_strategies
 
 
-def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    rows: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rows.append(json.loads(line))
-            except Exception:
-                continue
-    return rows
+# 提取最近 account/positions 快照时回看的行数；
+# 记录文件逐笔追加增长，整文件读入只为取末尾几行太浪费
+_STATE_TAIL_ROWS = 50
 
 
 def _tail_rows(rows: List[Dict[str, Any]], n: int = 5) -> List[Dict[str, Any]]:
@@ -72,9 +83,23 @@ def _extract_latest_positions_snapshot(balance_rows: List[Dict[str, Any]]) -> Li
     return []
 
 
-def _execute_trade_plan(trade_plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _execute_trade_plan(
+    trade_plan: List[Dict[str, Any]],
+    isolate: bool = False,
+) -> List[Dict[str, Any]]:
     exec_script = SCRIPT_DIR / "execute_alpaca_trade.py"
     results: List[Dict[str, Any]] = []
+
+    # 默认进程内执行：import 一次、复用同一个 TradingClient，
+    # 免去逐单 ~100ms 的解释器启动与 JSON stdout 解析；
+    # --isolate-trades 或导入失败时退回逐单子进程
+    eat = None
+    if not isolate:
+        try:
+            import execute_alpaca_trade as eat
+        except Exception as e:
+            print(f"⚠️ 进程内执行不可用，回退子进程: {e}")
+
     for item in trade_plan:
         action = str(item.get("action", "")).lower().strip()
         symbol = str(item.get("symbol", "")).upper().strip()
@@ -89,6 +114,14 @@ def _execute_trade_plan(trade_plan: List[Dict[str, Any]]) -> List[Dict[str, Any]
             )
             continue
 
+        if eat is not None:
+            try:
+                payload = eat.execute(action, symbol, qty)
+                results.append({"status": "ok", "trade": payload})
+            except Exception as e:
+                results.append({"status": "failed", "input": item, "error": str(e)})
+            continue
+
         cmd = [
             sys.executable,
             str(exec_script),
@@ -174,21 +207,54 @@ def _compute_news_rank(item: Dict[str, Any]) -> Dict[str, Any]:
             "momentum_score": -1.0,
         }
 
-    latest_ts = max((_parse_av_time(a.get("time_published", "")) for a in articles), default=None)
-    for a in articles:
-        base = _article_signal(a)
-        ts = _parse_av_time(a.get("time_published", ""))
-        if latest_ts is not None and ts is not None:
-            delta_hours = max((latest_ts - ts).total_seconds() / 3600.0, 0.0)
-            recency_weight = 1.0 / (1.0 + delta_hours / 24.0)  # 半衰近似：按天衰减
-        else:
-            recency_weight = 0.7
-        scores.append(base * recency_weight)
+    # 每篇文章只解析一次时间，之后的衰减计算全是数组运算
+    parsed = [_parse_av_time(a.get("time_published", "")) for a in articles]
+    latest_ts = max((t for t in parsed if t is not None), default=None)
+
+    if np is not None and latest_ts is not None:
+        # 向量化：情绪混合与衰减权重整条算完，文章池大时比逐篇 Python 循环快一个量级
+        nan = float("nan")
+        ticker_arr = np.array(
+            [v if (v := _to_float(a.get("target_ticker_sentiment_score"))) is not None else nan for a in articles],
+            dtype=np.float64,
+        )
+        overall_arr = np.array(
+            [v if (v := _to_float(a.get("overall_sentiment_score"))) is not None else nan for a in articles],
+            dtype=np.float64,
+        )
+        # 与 _article_signal 同语义：双有取加权，单有取其一，全无记 0
+        t_ok = ~np.isnan(ticker_arr)
+        o_ok = ~np.isnan(overall_arr)
+        t_filled = np.where(t_ok, ticker_arr, 0.0)
+        o_filled = np.where(o_ok, overall_arr, 0.0)
+        base_arr = np.where(
+            t_ok & o_ok,
+            0.7 * t_filled + 0.3 * o_filled,
+            np.where(t_ok, t_filled, o_filled),
+        )
+        latest_epoch = latest_ts.timestamp()
+        ts_arr = np.array(
+            [t.timestamp() if t is not None else np.nan for t in parsed], dtype=np.float64
+        )
+        delta_hours = np.maximum((latest_epoch - ts_arr) / 3600.0, 0.0)
+        weights = 1.0 / (1.0 + delta_hours / 24.0)  # 半衰近似：按天衰减
+        weights = np.where(np.isnan(ts_arr), 0.7, weights)
+        score_sum = float((base_arr * weights).sum())
+    else:
+        bases = [_article_signal(a) for a in articles]
+        for base, ts in zip(bases, parsed):
+            if latest_ts is not None and ts is not None:
+                delta_hours = max((latest_ts - ts).total_seconds() / 3600.0, 0.0)
+                recency_weight = 1.0 / (1.0 + delta_hours / 24.0)  # 半衰近似：按天衰减
+            else:
+                recency_weight = 0.7
+            scores.append(base * recency_weight)
+        score_sum = sum(scores)
 
     # 少样本惩罚，避免 1-2 条新闻噪声过大
     count = len(articles)
     count_penalty = min(count / 5.0, 1.0)
-    momentum = (sum(scores) / max(count, 1)) * count_penalty
+    momentum = (score_sum / max(count, 1)) * count_penalty
     return {
         "ticker": item.get("ticker"),
         "news_count": count,
@@ -200,15 +266,19 @@ def _compute_news_rank(item: Dict[str, Any]) -> Dict[str, Any]:
 
 def _select_top_by_news(news_items: List[Dict[str, Any]], top_k: int) -> Tuple[List[str], List[Dict[str, Any]]]:
     scored = [_compute_news_rank(item) for item in news_items]
-    ranked = sorted(
-        scored,
-        key=lambda x: (
-            _to_float(x.get("momentum_score")) if _to_float(x.get("momentum_score")) is not None else -999,
-            _to_float(x.get("avg_ticker_sentiment_score")) if _to_float(x.get("avg_ticker_sentiment_score")) is not None else -999,
+
+    # sorted 的 key 每个元素只求值一次（装饰-排序-还原），
+    # 键提取已是 O(N)，无需再把键写回字典
+    def _rank_key(x: Dict[str, Any]) -> Tuple[float, float, int]:
+        momentum = _to_float(x.get("momentum_score"))
+        ticker_avg = _to_float(x.get("avg_ticker_sentiment_score"))
+        return (
+            momentum if momentum is not None else -999,
+            ticker_avg if ticker_avg is not None else -999,
             x.get("news_count", 0),
-        ),
-        reverse=True,
-    )
+        )
+
+    ranked = sorted(scored, key=_rank_key, reverse=True)
     selected = [x.get("ticker") for x in ranked[:top_k] if x.get("ticker")]
     return selected, ranked
 
@@ -290,17 +360,19 @@ def _compute_round2_scores(
     return scored
 
 
+# 简单抽取：S&P500/NASDAQ 当日上涨概率；模块级预编译，逐次调用零编译开销
+_POLYMARKET_YES_PATTERNS = [
+    re.compile(r"S&P 500.*?\|\s*Yes:\s*([0-9]+(?:\.[0-9]+)?)%", re.IGNORECASE | re.DOTALL),
+    re.compile(r"NASDAQ.*?\|\s*Yes:\s*([0-9]+(?:\.[0-9]+)?)%", re.IGNORECASE | re.DOTALL),
+]
+
+
 def _extract_polymarket_market_signal(polymarket_text: str) -> Optional[float]:
     if not polymarket_text:
         return None
     signals: List[float] = []
-    # 简单抽取：S&P500/NASDAQ 当日上涨概率
-    patterns = [
-        r"S&P 500.*?\|\s*Yes:\s*([0-9]+(?:\.[0-9]+)?)%",
-        r"NASDAQ.*?\|\s*Yes:\s*([0-9]+(?:\.[0-9]+)?)%",
-    ]
-    for pat in patterns:
-        m = re.search(pat, polymarket_text, flags=re.IGNORECASE | re.DOTALL)
+    for pattern in _POLYMARKET_YES_PATTERNS:
+        m = pattern.search(polymarket_text)
         if m:
             yes_prob = float(m.group(1)) / 100.0
             # 概率映射到 [-1, 1]
@@ -312,7 +384,7 @@ def _extract_polymarket_market_signal(polymarket_text: str) -> Optional[float]:
 
 def _extract_benchmark_signal(news_items: List[Dict[str, Any]], benchmark_tickers: List[str]) -> Optional[float]:
     values: List[float] = []
-    targets = {t.upper() for t in benchmark_tickers}
+    targets = frozenset(t.upper() for t in benchmark_tickers)
     for item in news_items:
         if str(item.get("ticker", "")).upper() not in targets:
             continue
@@ -323,6 +395,8 @@ def _extract_benchmark_signal(news_items: List[Dict[str, Any]], benchmark_ticker
             values.append(v)
     if not values:
         return None
+    if np is not None:
+        return float(np.fromiter(values, dtype=np.float64, count=len(values)).mean())
     return sum(values) / len(values)
 
 
@@ -374,6 +448,11 @@ def main() -> None:
         default=75.0,
         help="AlphaVantage 限速，默认 75 次/分钟",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="跳过 AlphaVantage 基本面/新闻磁盘缓存，强制拉取最新数据",
+    )
     parser.add_argument(
         "--trade-plan-file",
         type=str,
@@ -385,6 +464,11 @@ def main() -> None:
         action="store_true",
         help="是否实际执行交易（未开启仅分析不交易）",
     )
+    parser.add_argument(
+        "--isolate-trades",
+        action="store_true",
+        help="每笔交易用独立子进程执行（默认进程内复用客户端）",
+    )
     parser.add_argument(
         "--output-file",
         type=str,
@@ -409,8 +493,8 @@ def main() -> None:
     data_dir = SCRIPT_DIR.parent / "data"
     position_path = data_dir / "position" / "position.jsonl"
     balance_path = data_dir / "balance" / "balance.jsonl"
-    old_positions = _read_jsonl(position_path)
-    old_balances = _read_jsonl(balance_path)
+    old_positions = read_jsonl_tail(position_path, _STATE_TAIL_ROWS)
+    old_balances = read_jsonl_tail(balance_path, _STATE_TAIL_ROWS)
 
     # 第一阶段：基于策略进行预筛选（默认 w_bottom_breakout）
     selected_strategy = str(strategy_config.get("name", "")).strip().lower()
@@ -419,7 +503,9 @@ def main() -> None:
 
     print(f"🧠 第一阶段：策略预筛选（strategy={selected_strategy or 'N/A'}，Top{top_k}）...")
     snapshot = _load_market_snapshot()
-    prefilter_quotes: List[Dict[str, Any]] = [get_quote(ticker, snapshot) for ticker in tickers]
+    # 快照一次性建哈希索引，后续两轮报价提取都是 O(1) 字典查找
+    symbol_index = build_symbol_index(snapshot)
+    prefilter_quotes: List[Dict[str, Any]] = [get_quote(ticker, symbol_index) for ticker in tickers]
     prefilter_context = {
         "universe_tickers": tickers,
         "quotes": prefilter_quotes,
@@ -448,28 +534,38 @@ def main() -> None:
     print(f"🔎 第二阶段深度分析标的数: {len(deep_universe)}")
 
     # 第二阶段：深度分析（策略候选 + 基准ETF）
+    # 新闻全流程只拉这一次（deep_universe 已含基准ETF 且去重），
+    # 短时间内的重复调用由请求层 TTL 缓存兜底
     print("📰 第二阶段：候选标的 + 基准ETF 新闻情绪...")
     deep_news = fetch_news_per_ticker(
         tickers=deep_universe,
         per_ticker_limit=max(1, args.news_limit),
         sort="LATEST",
         request_interval=interval,
+        use_cache=not args.no_cache,
     )
 
     print("📚 第二阶段：基本面...")
-    fundamentals: List[Dict[str, Any]] = []
-    for idx, ticker in enumerate(deep_universe, 1):
-        print(f"[{idx}/{len(deep_universe)}] 基本面: {ticker}")
+    # 各标的抓取互不依赖，线程池并发；全局共享一把限速器，
+    # 发起间隔仍满足 AlphaVantage 配额，网络往返彼此重叠
+    fundamentals_limiter = _RateLimiter(interval)
+
+    def _fetch_fundamentals(ticker: str) -> Dict[str, Any]:
         try:
-            fundamentals.append(
-                fetch_fundamentals_for_symbol(
-                    ticker,
-                    days=args.days,
-                    endpoint_request_interval=interval,
-                )
+            return fetch_fundamentals_for_symbol(
+                ticker,
+                days=args.days,
+                rate_limiter=fundamentals_limiter,
+                use_cache=not args.no_cache,
             )
         except Exception as e:
-            fundamentals.append({"symbol": ticker, "error": str(e)})
+            return {"symbol": ticker, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(deep_universe))) as pool:
+        fundamentals: List[Dict[str, Any]] = []
+        for idx, block in enumerate(pool.map(_fetch_fundamentals, deep_universe), 1):
+            print(f"[{idx}/{len(deep_universe)}] 基本面: {block.get('symbol')}")
+            fundamentals.append(block)
 
     # Polymarket 市场赔率
     print("📊 获取 Polymarket 赔率...")
@@ -480,9 +576,7 @@ def main() -> None:
 
     # tvscreener 价格 + 技术面
     print("📈 第二阶段：tvscreener 价格与技术面...")
-    quotes: List[Dict[str, Any]] = []
-    for ticker in deep_universe:
-        quotes.append(get_quote(ticker, snapshot))
+    quotes: List[Dict[str, Any]] = [get_quote(ticker, symbol_index) for ticker in deep_universe]
 
     _, deep_news_ranking = _select_top_by_news(deep_news, top_k=max(len(round1_candidates), 1))
     round2_scores = _compute_round2_scores(
@@ -587,7 +681,7 @@ def main() -> None:
 
     if args.execute_trades and trade_plan and should_trade_by_market:
         print(f"🧾 执行交易计划，共 {len(trade_plan)} 条...")
-        trade_results = _execute_trade_plan(trade_plan)
+        trade_results = _execute_trade_plan(trade_plan, isolate=args.isolate_trades)
     elif args.execute_trades and trade_plan and not should_trade_by_market:
         print("🛑 市场门控未通过，跳过执行交易。")
         trade_results = [{"status": "blocked_by_market_gate", "market_gate_score": market_gate_score}]
@@ -595,8 +689,8 @@ def main() -> None:
         print("⚠️ 已指定执行交易，但交易计划为空，跳过执行。")
 
     # 6) 读取交易后状态
-    new_positions = _read_jsonl(position_path)
-    new_balances = _read_jsonl(balance_path)
+    new_positions = read_jsonl_tail(position_path, 5)
+    new_balances = read_jsonl_tail(balance_path, 5)
 
     output = {
         "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -661,7 +755,13 @@ def main() -> None:
 
     out_path = Path(args.output_file)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding="utf-8")
+    # 先写临时文件再原子换名：看板/cron 等并发读者永远只见完整文件
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_dumps_pretty(output))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, out_path)
     print(f"✅ 流程完成，结果已写入: {out_path}")
 
 
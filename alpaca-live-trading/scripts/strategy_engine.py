@@ -11,6 +11,11 @@ from pathlib import Path
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy 为可选加速依赖
+    np = None
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 DEFAULT_DAILY_DB_PATH = SCRIPT_DIR.parent / "data" / "stock_daily.sqlite"
 
@@ -76,6 +81,8 @@ def _extract_recommend_all(quote: Optional[Dict[str, Any]]) -> Optional[float]:
 
 
 def _load_daily_bars_from_sqlite(db_path: Path, symbol: str, limit: int = 420) -> List[Dict[str, float]]:
+    # 直接从 sqlite 取原生行、组装普通 dict，
+    # 刻意不经 pandas DataFrame（省去索引构建与 dtype 推断的开销）
     if not db_path.exists():
         return []
     query = """
@@ -109,8 +116,22 @@ def _load_daily_bars_from_sqlite(db_path: Path, symbol: str, limit: int = 420) -
 
 
 def _simple_local_lows(closes: List[float], window: int = 3) -> List[int]:
+    n = len(closes)
+    if n <= 2 * window:
+        return []
+    if np is not None:
+        # 滑窗最小值向量化：win_min[j] = min(closes[j:j+window])，
+        # i 的左窗最小即 win_min[i-window]、右窗最小即 win_min[i+1]，
+        # 每个候选点的逐元素切片/min 全部下沉到 C 层
+        arr = np.asarray(closes, dtype=np.float64)
+        win_min = np.lib.stride_tricks.sliding_window_view(arr, window).min(axis=1)
+        cur = arr[window : n - window]
+        left_min = win_min[: n - 2 * window]
+        right_min = win_min[window + 1 : n - window + 1]
+        idx = np.flatnonzero((cur <= left_min) & (cur <= right_min)) + window
+        return idx.tolist()
     out: List[int] = []
-    for i in range(window, len(closes) - window):
+    for i in range(window, n - window):
         cur = closes[i]
         left = closes[i - window : i]
         right = closes[i + 1 : i + window + 1]
@@ -253,6 +274,8 @@ def _run_w_bottom_breakout(context: Dict[str, Any]) -> List[StrategySignal]:
     ret120_map: Dict[str, Optional[float]] = {}
     ret250_map: Dict[str, Optional[float]] = {}
 
+    # 每次运行都是独立进程，特征没法跨轮增量维护；
+    # 历史数据的「增量」已由上游同步脚本落在 sqlite 里，这里只做读取
     for symbol in symbols:
         bars = _load_daily_bars_from_sqlite(db_path, symbol, limit=lookback)
         if len(bars) < 120:
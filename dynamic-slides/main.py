@@ -3,9 +3,11 @@ Dynamic-Slides 主入口脚本
 将 PPT 图片转换为流畅的动态视频
 """
 
+import os
 import re
 import sys
 import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import List, Tuple
@@ -19,6 +21,9 @@ from config import PPT_DIR, OUTPUT_DIR, SUPPORTED_IMAGE_FORMATS
 from kling_api import generate_transition_video, get_transition_prompt
 from video_composer import concatenate_videos, check_ffmpeg
 
+# 文件名取数字排序用；模块级预编译，避免每个文件名重新编译
+_NUM_RE = re.compile(r'\d+')
+
 
 def get_sorted_images(ppt_dir: Path) -> List[Path]:
     """
@@ -38,15 +43,16 @@ def get_sorted_images(ppt_dir: Path) -> List[Path]:
     if not ppt_dir.exists():
         raise FileNotFoundError(f"PPT 文件夹不存在: {ppt_dir}")
     
-    # 获取所有支持格式的图片（使用 set 去重，因为 Windows 不区分大小写）
-    images_set = set()
-    for ext in SUPPORTED_IMAGE_FORMATS:
-        images_set.update(ppt_dir.glob(f"*{ext}"))
-        images_set.update(ppt_dir.glob(f"*{ext.upper()}"))
-    
-    # 过滤掉 .gitkeep 等非图片文件
-    images = [img for img in images_set if img.suffix.lower() in SUPPORTED_IMAGE_FORMATS]
-    
+    # 单次 scandir 扫描目录，按小写后缀过滤；
+    # 比「4 种扩展名 × 大小写」共 8 次 glob 少 8 倍目录遍历，
+    # 也天然兼容 Windows 的大小写不敏感文件名
+    with os.scandir(ppt_dir) as it:
+        images = [
+            Path(entry.path)
+            for entry in it
+            if entry.is_file() and entry.name.lower().endswith(SUPPORTED_IMAGE_FORMATS)
+        ]
+
     if not images:
         raise FileNotFoundError(
             f"PPT 文件夹中没有找到图片!\n"
@@ -58,10 +64,8 @@ def get_sorted_images(ppt_dir: Path) -> List[Path]:
     def extract_number(path: Path) -> int:
         """从文件名中提取数字用于排序"""
         # 匹配文件名中的数字
-        numbers = re.findall(r'\d+', path.stem)
-        if numbers:
-            return int(numbers[0])
-        return 0
+        m = _NUM_RE.search(path.stem)
+        return int(m.group()) if m else 0
     
     images.sort(key=extract_number)
     
@@ -135,27 +139,40 @@ def main():
     print(f"\n📝 转场提示词: {prompt[:80]}...")
     
     # 生成所有转场视频
-    video_paths = []
+    # 每个转场是独立的「上传 + 等待 Kling 推理」的 I/O 等待，
+    # 并发提交后总耗时约为 串行时间/并发数；并发数可用 KLING_CONCURRENCY 调整
+    concurrency = max(1, int(os.getenv("KLING_CONCURRENCY", "4")))
+    results: List[Path] = [None] * len(pairs)
     failed = []
-    
-    for start_img, end_img, idx in pairs:
-        output_video = output_dir / f"{idx}.mp4"
-        
-        try:
-            generate_transition_video(
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(pairs))) as pool:
+        futures = {}
+        for i, (start_img, end_img, idx) in enumerate(pairs):
+            output_video = output_dir / f"{idx}.mp4"
+            future = pool.submit(
+                generate_transition_video,
                 start_image_path=start_img,
                 end_image_path=end_img,
                 prompt=prompt,
                 output_path=output_video,
             )
-            video_paths.append(output_video)
-            print(f"\n✓ 视频 {idx}/{len(pairs)} 生成成功!")
-            
-        except Exception as e:
-            print(f"\n❌ 视频 {idx}/{len(pairs)} 生成失败: {e}")
-            failed.append((idx, str(e)))
+            futures[future] = (i, idx, output_video)
+
+        for future in as_completed(futures):
+            i, idx, output_video = futures[future]
+            try:
+                future.result()
+                results[i] = output_video
+                print(f"\n✓ 视频 {idx}/{len(pairs)} 生成成功!")
+            except Exception as e:
+                print(f"\n❌ 视频 {idx}/{len(pairs)} 生成失败: {e}")
+                failed.append((idx, str(e)))
+
+    # 按转场顺序收集成功的视频，保证拼接顺序不乱
+    video_paths = [p for p in results if p is not None]
     
     # 检查是否有失败的视频
+    failed.sort()
     if failed:
         print(f"\n⚠️  警告: {len(failed)} 个视频生成失败:")
         for idx, error in failed:
@@ -2,13 +2,94 @@
 FFmpeg 视频合成 - 将多个视频片段拼接成完整视频
 """
 
+import os
 import subprocess
 import shutil
+import sys
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows 无 fcntl
+    fcntl = None
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 from config import FFMPEG_CODEC, FFMPEG_FPS, FFMPEG_CRF
 
+# 硬件加速探测结果缓存（进程内只跑一次 ffmpeg -hwaccels）
+_HWACCEL: Optional[str] = None
+_HWACCEL_PROBED = False
+
+
+def detect_hwaccel() -> Optional[str]:
+    """
+    探测可用的 ffmpeg 硬件加速
+
+    NVIDIA 机器返回 "cuda"（NVENC 编码比 x264 快 5-10 倍且几乎不占 CPU），
+    macOS 返回 "videotoolbox"，否则返回 None 走软件编码。
+
+    Returns:
+        硬件加速名称或 None
+    """
+    global _HWACCEL, _HWACCEL_PROBED
+    if _HWACCEL_PROBED:
+        return _HWACCEL
+    _HWACCEL_PROBED = True
+
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True, text=True,
+        )
+        accels = set(result.stdout.split())
+    except OSError:
+        accels = set()
+
+    if "cuda" in accels:
+        _HWACCEL = "cuda"
+    elif "videotoolbox" in accels and sys.platform == "darwin":
+        _HWACCEL = "videotoolbox"
+
+    if _HWACCEL:
+        print(f"✓ 检测到硬件加速: {_HWACCEL}")
+    return _HWACCEL
+
+
+def _hw_input_args(hwaccel: Optional[str]) -> List[str]:
+    """输入侧的硬件解码参数（解码留在 GPU，省掉 CPU 解码）"""
+    if hwaccel == "cuda":
+        return ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+    if hwaccel == "videotoolbox":
+        return ["-hwaccel", "videotoolbox"]
+    return []
+
+
+def _hw_encode_args(hwaccel: Optional[str]) -> List[str]:
+    """输出侧的编码参数；无硬件时回落 config 里的软件编码器"""
+    if hwaccel == "cuda":
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq",
+                "-rc", "vbr", "-cq", str(FFMPEG_CRF)]
+    if hwaccel == "videotoolbox":
+        return ["-c:v", "h264_videotoolbox", "-q:v", "60"]
+    return ["-c:v", FFMPEG_CODEC, "-crf", str(FFMPEG_CRF), "-preset", "medium"]
+
+
+def _normalize_filter(hwaccel: Optional[str], target_width: int, target_height: int) -> str:
+    """归一化滤镜链；CUDA 时缩放在 GPU 上做，pad 无 CUDA 实现需下载回内存"""
+    if hwaccel == "cuda":
+        return (
+            f"scale_cuda={target_width}:{target_height}:force_original_aspect_ratio=decrease,"
+            f"hwdownload,format=nv12,"
+            f"pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2,"
+            f"fps={FFMPEG_FPS},format=yuv420p"
+        )
+    return (
+        f"scale={target_width}:{target_height}:force_original_aspect_ratio=decrease,"
+        f"pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2,"
+        f"fps={FFMPEG_FPS},format=yuv420p"
+    )
+
 
 def check_ffmpeg() -> bool:
     """
@@ -40,23 +121,30 @@ def get_video_info(video_path: Path) -> dict:
         "ffprobe",
         "-v", "error",
         "-select_streams", "v:0",
-        "-show_entries", "stream=width,height,duration,r_frame_rate",
-        "-of", "csv=p=0",
+        "-show_entries", "stream=width,height,duration,r_frame_rate,pix_fmt",
+        "-of", "default=noprint_wrappers=1",
         str(video_path)
     ]
-    
+
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        parts = result.stdout.strip().split(",")
-        if len(parts) >= 3:
+        # key=value 输出不受字段顺序影响，比按位置切 csv 稳
+        fields = dict(
+            line.split("=", 1)
+            for line in result.stdout.strip().splitlines()
+            if "=" in line
+        )
+        if "width" in fields and "height" in fields:
             return {
-                "width": int(parts[0]),
-                "height": int(parts[1]),
-                "duration": float(parts[2]) if parts[2] else 0,
+                "width": int(fields["width"]),
+                "height": int(fields["height"]),
+                "duration": float(fields["duration"]) if fields.get("duration") else 0,
+                "fps": fields.get("r_frame_rate", ""),
+                "pix_fmt": fields.get("pix_fmt", ""),
             }
     except Exception as e:
         print(f"警告: 无法获取视频信息 {video_path}: {e}")
-    
+
     return {}
 
 
@@ -93,22 +181,55 @@ def concatenate_videos(
     
     # 创建临时文件列表
     filelist_path = output_path.parent / "filelist.txt"
-    
+    normalized_paths: List[Path] = []
+
     try:
+        concat_sources = video_paths
+        use_stream_copy = not normalize_resolution
+
+        if normalize_resolution and _all_clips_match(video_paths):
+            # 各段本就出自同一条流水线（相同分辨率/帧率/像素格式），
+            # 归一化重编码是白做的；直接流拷贝，一个像素都不碰
+            print("\n✓ 各段格式一致，跳过重编码，直接流拷贝拼接")
+            normalize_resolution = False
+            use_stream_copy = True
+
+        if normalize_resolution:
+            # 每段单独归一化（各自一个 ffmpeg 进程，x264 编码吃满多核），
+            # 之后用 concat demuxer 流拷贝一次拼接，不再整体重编码
+            norm_dir = output_path.parent / ".normalized"
+            norm_dir.mkdir(parents=True, exist_ok=True)
+            normalized_paths = [norm_dir / f"{p.stem}_norm.mp4" for p in video_paths]
+
+            cpu = os.cpu_count() or 1
+            workers = min(cpu, len(video_paths))
+            # 每个 ffmpeg 限制线程数，避免 N 个进程各开满核互相争抢
+            threads_per_proc = max(1, cpu // workers)
+            print(f"\n🛠  并行归一化 {len(video_paths)} 段（{workers} 路 × {threads_per_proc} 线程）...")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                oks = list(pool.map(
+                    lambda src, dst: _normalize_one(src, dst, threads=threads_per_proc),
+                    video_paths, normalized_paths,
+                ))
+
+            if all(oks):
+                concat_sources = normalized_paths
+                use_stream_copy = True
+            else:
+                # 任一段归一化失败则退回单命令 filter_complex 整体重编码
+                print("  ⚠️ 部分片段归一化失败，退回整体重编码拼接")
+
         # 写入文件列表
         with open(filelist_path, "w", encoding="utf-8") as f:
-            for video_path in video_paths:
+            for source_path, video_path in zip(concat_sources, video_paths):
                 # 使用绝对路径，并转义特殊字符
-                abs_path = str(video_path.absolute()).replace("\\", "/")
+                abs_path = str(source_path.absolute()).replace("\\", "/")
                 f.write(f"file '{abs_path}'\n")
                 print(f"  + {video_path.name}")
-        
+
         # 构建 FFmpeg 命令
-        if normalize_resolution:
-            # 使用 filter_complex 统一分辨率和帧率
-            cmd = build_normalized_concat_command(video_paths, output_path)
-        else:
-            # 简单拼接（要求所有视频格式一致）
+        if use_stream_copy:
+            # 简单拼接（各视频格式已一致）
             cmd = [
                 "ffmpeg",
                 "-y",  # 覆盖输出文件
@@ -118,7 +239,10 @@ def concatenate_videos(
                 "-c", "copy",
                 str(output_path)
             ]
-        
+        else:
+            # 使用 filter_complex 统一分辨率和帧率
+            cmd = build_normalized_concat_command(video_paths, output_path)
+
         print(f"\n⚙️  执行 FFmpeg 命令...")
         
         # 执行命令
@@ -147,6 +271,72 @@ def concatenate_videos(
         # 清理临时文件
         if filelist_path.exists():
             filelist_path.unlink()
+        for norm_path in normalized_paths:
+            norm_path.unlink(missing_ok=True)
+        if normalized_paths:
+            try:
+                normalized_paths[0].parent.rmdir()
+            except OSError:
+                pass
+
+
+def _all_clips_match(video_paths: List[Path]) -> bool:
+    """
+    探测各段分辨率/帧率/像素格式是否完全一致（并行 ffprobe）。
+
+    一致时 concat demuxer 可以直接流拷贝，免掉整轮解码+编码。
+    任一段探测失败按不一致处理，走安全的重编码路径。
+    """
+    if len(video_paths) <= 1:
+        return True
+
+    with ThreadPoolExecutor(max_workers=min(8, len(video_paths))) as pool:
+        infos = list(pool.map(get_video_info, video_paths))
+
+    def _signature(info: dict):
+        return (info.get("width"), info.get("height"),
+                info.get("fps"), info.get("pix_fmt"))
+
+    first = _signature(infos[0])
+    if None in first or "" in first:
+        return False
+    return all(_signature(info) == first for info in infos[1:])
+
+
+def _normalize_one(
+    video_path: Path,
+    normalized_path: Path,
+    target_width: int = 1920,
+    target_height: int = 1080,
+    threads: int = 0,
+) -> bool:
+    """
+    把单段视频归一化到统一分辨率/帧率（供并行调用）。
+
+    重活在 ffmpeg 子进程里，线程只负责等待，
+    并行度即核数时 x264 编码近线性加速。
+    有 NVENC/VideoToolbox 时走硬件编解码，失败自动重试软件路径。
+    """
+    hwaccel = detect_hwaccel()
+    for hw in ([hwaccel, None] if hwaccel else [None]):
+        cmd = [
+            "ffmpeg",
+            "-y",
+            *_hw_input_args(hw),
+            "-i", str(video_path),
+            "-vf", _normalize_filter(hw, target_width, target_height),
+            *_hw_encode_args(hw),
+            *(["-threads", str(threads)] if threads > 0 and hw is None else []),
+            "-an",
+            str(normalized_path)
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode == 0:
+            return True
+        if hw:
+            print(f"  ⚠️ 硬件归一化失败 {video_path.name}，改用软件编码重试")
+    print(f"  ✗ 归一化失败 {video_path.name}: {result.stderr[-300:]}")
+    return False
 
 
 def build_normalized_concat_command(
@@ -167,11 +357,15 @@ def build_normalized_concat_command(
     Returns:
         FFmpeg 命令列表
     """
+    hwaccel = detect_hwaccel()
     cmd = ["ffmpeg", "-y"]
-    
+
     # 添加所有输入文件
+    # filter_complex 里的 scale/pad 是 CPU 滤镜，解码用 -hwaccel 但不指定
+    # GPU 帧输出格式，ffmpeg 会自动下载回系统内存供滤镜使用
+    decode_args = ["-hwaccel", hwaccel] if hwaccel else []
     for video_path in video_paths:
-        cmd.extend(["-i", str(video_path)])
+        cmd.extend([*decode_args, "-i", str(video_path)])
     
     # 构建 filter_complex
     n = len(video_paths)
@@ -194,9 +388,7 @@ def build_normalized_concat_command(
     cmd.extend([
         "-filter_complex", filter_complex,
         "-map", "[outv]",
-        "-c:v", FFMPEG_CODEC,
-        "-crf", str(FFMPEG_CRF),
-        "-preset", "medium",
+        *_hw_encode_args(hwaccel),
         str(output_path)
     ])
     
@@ -219,23 +411,125 @@ def create_video_from_image(
     Returns:
         是否成功
     """
+    return create_videos_from_images([(image_path, output_path, duration)])
+
+
+def create_videos_from_images(
+    jobs: List[Tuple[Path, Path, float]],
+) -> bool:
+    """
+    批量从静态图片创建视频：单次 ffmpeg 调用产出全部片段
+
+    每个片段单独起一个 ffmpeg 进程要各付 ~150ms 的启动/初始化开销，
+    整副 PPT 几十张时很可观；一条命令多输入多输出组把这些开销摊平。
+
+    Args:
+        jobs: (图片路径, 输出视频路径, 时长秒) 列表
+
+    Returns:
+        是否全部成功
+    """
+    if not jobs:
+        return True
+
     if not check_ffmpeg():
         return False
-    
+
+    cmd = ["ffmpeg", "-y"]
+
+    # 输入组：每张图一个 -loop 1 输入
+    for image_path, _, _ in jobs:
+        cmd.extend(["-loop", "1", "-i", str(image_path)])
+
+    # 输出组：各自 -map 对应输入，带独立时长与滤镜
+    for i, (_, output_path, duration) in enumerate(jobs):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        cmd.extend([
+            "-map", f"{i}:v",
+            "-t", str(duration),
+            "-vf", f"fps={FFMPEG_FPS},scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
+            "-c:v", FFMPEG_CODEC,
+            "-crf", str(FFMPEG_CRF),
+            "-pix_fmt", "yuv420p",
+            str(output_path)
+        ])
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"  ✗ 图片转视频失败: {result.stderr[-300:]}")
+        return False
+    return True
+
+
+def create_video_from_frame(
+    frame: bytes,
+    width: int,
+    height: int,
+    output_path: Path,
+    duration: float = 2.0,
+) -> bool:
+    """
+    从内存中的原始 RGB 帧创建视频（免落盘、免 PNG 编解码）
+
+    上游已经持有像素数据时（如 PIL 的 ``img.tobytes()``），
+    经由 rawvideo 管道直接喂给 ffmpeg，跳过「写 PNG → ffmpeg 再解码」
+    两趟无谓的编解码与磁盘 I/O。Linux 上把管道扩到 1MB，
+    避免 64KB 默认管道在 1080p 帧（约 6MB）上的反复阻塞。
+
+    Args:
+        frame: rgb24 排列的一帧像素字节（len == width*height*3）
+        width: 帧宽
+        height: 帧高
+        output_path: 输出视频路径
+        duration: 视频时长（秒）
+
+    Returns:
+        是否成功
+    """
+    if not check_ffmpeg():
+        return False
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    
+
     cmd = [
         "ffmpeg",
         "-y",
-        "-loop", "1",
-        "-i", str(image_path),
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-r", str(FFMPEG_FPS),
+        "-i", "-",
         "-c:v", FFMPEG_CODEC,
-        "-t", str(duration),
-        "-pix_fmt", "yuv420p",
-        "-vf", f"fps={FFMPEG_FPS},scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
         "-crf", str(FFMPEG_CRF),
+        "-pix_fmt", "yuv420p",
         str(output_path)
     ]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.returncode == 0
+
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=0,
+    )
+    if fcntl is not None and hasattr(fcntl, "F_SETPIPE_SZ"):
+        try:
+            fcntl.fcntl(proc.stdin.fileno(), fcntl.F_SETPIPE_SZ, 1 << 20)
+        except OSError:
+            pass  # 超出 /proc/sys/fs/pipe-max-size 等情况，保持默认大小
+
+    try:
+        for _ in range(max(1, int(FFMPEG_FPS * duration))):
+            proc.stdin.write(frame)
+    except BrokenPipeError:
+        pass
+    finally:
+        proc.stdin.close()
+
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+    if proc.wait() != 0:
+        tail = stderr.decode("utf-8", errors="replace")[-300:]
+        print(f"  ✗ 帧转视频失败: {tail}")
+        return False
+    return True
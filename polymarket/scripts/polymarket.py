@@ -18,11 +18,15 @@ import requests
 
 BASE_URL = "https://gamma-api.polymarket.com"
 
+# Shared session: commands like search/event hit the API more than once,
+# reusing the TLS connection skips a handshake per extra request
+_SESSION = requests.Session()
+
 
 def fetch(endpoint: str, params: dict = None) -> dict:
     """Fetch from Gamma API."""
     url = f"{BASE_URL}{endpoint}"
-    resp = requests.get(url, params=params, timeout=30)
+    resp = _SESSION.get(url, params=params, timeout=30)
     resp.raise_for_status()
     return resp.json()
 
@@ -162,7 +166,7 @@ def cmd_search(args):
     
     # Try search endpoint first
     try:
-        resp = requests.get(f"{BASE_URL}/search", params={'query': args.query, 'limit': args.limit}, timeout=30)
+        resp = _SESSION.get(f"{BASE_URL}/search", params={'query': args.query, 'limit': args.limit}, timeout=30)
         if resp.status_code == 200:
             data = resp.json()
             events = data if isinstance(data, list) else data.get('events', data.get('markets', []))
@@ -185,30 +189,34 @@ def cmd_search(args):
     
     # Fallback: get all events and filter
     data = fetch('/events', {'closed': 'false', 'limit': 100})
-    
+
     query_lower = args.query.lower()
     matches = []
-    
+
+    # API returns events sorted by relevance/volume, so stop scanning as
+    # soon as we have enough matches instead of filtering the whole payload
     for event in data:
         title = event.get('title', '').lower()
         desc = event.get('description', '').lower()
         if query_lower in title or query_lower in desc:
             matches.append(event)
-            continue
-        # Check markets
-        for m in event.get('markets', []):
-            q = m.get('question', '').lower()
-            if query_lower in q:
-                matches.append(event)
-                break
-    
+        else:
+            # Check markets
+            for m in event.get('markets', []):
+                q = m.get('question', '').lower()
+                if query_lower in q:
+                    matches.append(event)
+                    break
+        if len(matches) >= args.limit:
+            break
+
     print(f"🔍 **Search: '{args.query}'**\n")
-    
+
     if not matches:
         print("No markets found.")
         return
-    
-    for event in matches[:args.limit]:
+
+    for event in matches:
         print(format_event(event))
         print()
 
@@ -263,7 +271,8 @@ def cmd_category(args):
     
     data = fetch('/events', params)
     
-    # Filter by category in title/tags
+    # Filter by category in title/tags; events arrive volume-sorted,
+    # so bail out once we have enough
     matches = []
     tag_lower = tag.lower()
     for event in data:
@@ -271,6 +280,8 @@ def cmd_category(args):
         tags = [t.get('label', '').lower() for t in event.get('tags', [])]
         if tag_lower in title or tag_lower in ' '.join(tags):
             matches.append(event)
+            if len(matches) >= args.limit:
+                break
     
     print(f"📁 **Category: {args.category.title()}**\n")
     
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False, ascii_only: bool = False) -> bytes:
+    """
+    Serialize to JSON bytes, preferring orjson's native serializer.
+
+    Output is UTF-8; pass ascii_only=True for consumers that cannot handle
+    it (spec-compliant \\uXXXX escapes via stdlib json — orjson has no
+    ascii mode). Kept in its own module (instead of _tinyfish_client) so
+    CLI scripts can import it without pulling in the HTTP stack.
+    """
+    if ascii_only:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=True).encode("ascii")
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def write_json(
+    obj: Any,
+    indent: bool = False,
+    prefix: str | None = None,
+    ascii_only: bool = False,
+) -> None:
+    """
+    Write JSON bytes straight to the binary stdout buffer.
+
+    Skips the bytes -> str -> re-encode round trip that print(dumps(...))
+    would pay on large payloads. An optional prefix line is batched into
+    the same writelines call so status text + body cost one flush instead
+    of two. Falls back to a text write when stdout has been replaced by
+    something without a buffer (e.g. test capture).
+    """
+    payload = dumps(obj, indent=indent, ascii_only=ascii_only) + b"\n"
+    chunks = [payload] if prefix is None else [prefix.encode("utf-8") + b"\n", payload]
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        # Flush the text layer first so prior print() output stays ordered
+        sys.stdout.flush()
+        buffer.writelines(chunks)
+        buffer.flush()
+    else:
+        for chunk in chunks:
+            sys.stdout.write(chunk.decode("utf-8"))
@@ -8,10 +8,27 @@ from typing import Any, Dict, Iterator
 import requests
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+# orjson parses bytes directly with a C-level parser (3-10x faster);
+# stdlib json remains the drop-in fallback
+_loads = orjson.loads if orjson is not None else json.loads
+
 BASE_URL = "https://agent.tinyfish.ai/v1/automation"
 ROOT_DIR = Path(__file__).resolve().parents[1]
 ENV_PATH = ROOT_DIR / ".env"
 
+# Module-level session: keep-alive avoids a fresh TCP + TLS handshake
+# (~100-200 ms) on every call within one process
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4, pool_block=False),
+)
+
 
 def load_api_key() -> str:
     load_dotenv(ENV_PATH)
@@ -35,7 +52,7 @@ def run_sync(url: str, goal: str, timeout: int = 180, **extra_payload: Any) -> D
     payload.update(extra_payload)
 
     api_key = load_api_key()
-    response = requests.post(
+    response = _SESSION.post(
         f"{BASE_URL}/run",
         headers=_headers(api_key),
         json=payload,
@@ -58,7 +75,7 @@ def run_sse_events(
     payload.update(extra_payload)
 
     api_key = load_api_key()
-    with requests.post(
+    with _SESSION.post(
         f"{BASE_URL}/run-sse",
         headers=_headers(api_key),
         json=payload,
@@ -71,13 +88,17 @@ def run_sse_events(
             body = response.text[:800]
             raise requests.HTTPError(f"{exc}. Response body: {body}") from exc
 
-        for line in response.iter_lines(decode_unicode=True):
-            if not line or not line.startswith("data: "):
+        # Iterate raw bytes with a 64 KB read buffer: skips the per-line
+        # unicode decode that decode_unicode=True does for every SSE line,
+        # and only the JSON payload slice ever gets parsed (json.loads
+        # accepts bytes directly)
+        for line in response.iter_lines(chunk_size=65536):
+            if not line or not line.startswith(b"data: "):
                 continue
             raw_json = line[6:].strip()
             if not raw_json:
                 continue
             try:
-                yield json.loads(raw_json)
-            except json.JSONDecodeError:
-                yield {"type": "RAW", "message": raw_json}
+                yield _loads(raw_json)
+            except ValueError:  # shared base of json's and orjson's JSONDecodeError
+                yield {"type": "RAW", "message": raw_json.decode("utf-8", errors="replace")}
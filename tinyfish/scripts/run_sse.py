@@ -1,8 +1,14 @@
 import argparse
-import json
 import sys
 
-from _tinyfish_client import run_sse_events
+from _json_fast import write_json
+
+# Built once at import; callers take a shallow copy so the constant
+# itself is never mutated
+_STEALTH_PAYLOAD = {
+    "browser_profile": "stealth",
+    "proxy_config": {"enabled": True, "country_code": "US"},
+}
 
 
 def main() -> int:
@@ -16,10 +22,11 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    extra_payload = {}
-    if args.stealth:
-        extra_payload["browser_profile"] = "stealth"
-        extra_payload["proxy_config"] = {"enabled": True, "country_code": "US"}
+    extra_payload = dict(_STEALTH_PAYLOAD) if args.stealth else {}
+
+    # Deferred import: --help and argparse errors exit before paying for
+    # the requests/dotenv import graph behind the client module
+    from _tinyfish_client import run_sse_events
 
     print("Streaming TinyFish events...")
     for event in run_sse_events(args.url, args.goal, **extra_payload):
@@ -29,11 +36,11 @@ def main() -> int:
             print(f"[PROGRESS] {purpose}")
         elif event_type == "COMPLETE":
             status = event.get("status", "UNKNOWN")
-            print(f"[COMPLETE] status={status}")
-            print(json.dumps(event, indent=2, ensure_ascii=True))
+            # Indent only for humans; piped output gets compact JSON
+            write_json(event, indent=sys.stdout.isatty(), prefix=f"[COMPLETE] status={status}")
             return 0 if status == "COMPLETED" else 2
         else:
-            print(json.dumps(event, ensure_ascii=True))
+            write_json(event)
 
     print("No COMPLETE event was received before stream ended.", file=sys.stderr)
     return 3
@@ -1,11 +1,21 @@
 import argparse
-import json
+import functools
 import sys
 
-from _tinyfish_client import run_sync
+from _json_fast import write_json
 
+# Built once at import; callers take a shallow copy so the constant
+# itself is never mutated
+_STEALTH_PAYLOAD = {
+    "browser_profile": "stealth",
+    "proxy_config": {"enabled": True, "country_code": "US"},
+}
 
-def main() -> int:
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    # Memoized so library-style callers invoking main() in a loop build
+    # the parser (actions, formatter, etc.) only once
     parser = argparse.ArgumentParser(description="Run TinyFish automation in synchronous mode.")
     parser.add_argument("--url", required=True, help="Target URL")
     parser.add_argument("--goal", required=True, help="Automation goal in natural language")
@@ -19,21 +29,38 @@ def main() -> int:
         action="store_true",
         help="Print compact JSON only",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--ascii",
+        action="store_true",
+        help="Escape non-ASCII characters in JSON output (default is UTF-8)",
+    )
+    return parser
 
-    extra_payload = {}
-    if args.stealth:
-        extra_payload["browser_profile"] = "stealth"
-        extra_payload["proxy_config"] = {"enabled": True, "country_code": "US"}
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    extra_payload = dict(_STEALTH_PAYLOAD) if args.stealth else {}
+
+    # Deferred import: --help and argparse errors exit before paying for
+    # the requests/dotenv import graph behind the client module
+    from _tinyfish_client import run_sync
 
     result = run_sync(args.url, args.goal, **extra_payload)
 
     if args.json_only:
-        print(json.dumps(result, ensure_ascii=True))
+        write_json(result, ascii_only=args.ascii)
         return 0
 
-    print("TinyFish sync run finished.")
-    print(json.dumps(result, indent=2, ensure_ascii=True))
+    # Indent only for humans: piped output (CI) gets compact JSON,
+    # skipping the whitespace-emission pass and shrinking the stream;
+    # status line and body share a single buffered write
+    write_json(
+        result,
+        indent=sys.stdout.isatty(),
+        prefix="TinyFish sync run finished.",
+        ascii_only=args.ascii,
+    )
     return 0
 
 
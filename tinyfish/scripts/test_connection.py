@@ -1,7 +1,53 @@
+import argparse
+import hashlib
 import json
+import os
 import sys
+import time
+from pathlib import Path
 
-from _tinyfish_client import run_sync
+from _json_fast import dumps, write_json
+
+CACHE_DIR = Path.home() / ".cache" / "tinyfish"
+CACHE_TTL_SECONDS = 3600
+
+
+def _cache_path(url: str, goal: str) -> Path:
+    digest = hashlib.sha1(f"{url}|{goal}".encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"conn_{digest}.json"
+
+
+def _load_cached(path: Path) -> dict | None:
+    """Return the cached result if present and within TTL, else None."""
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached(path: Path, result: dict) -> None:
+    """Atomic write (tmp + rename) so readers never see a partial file."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(dumps(result))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # caching is best-effort; never fail the test over it
+
+
+def _quiet_report(result: dict) -> int:
+    """One line for CI: status plus a short hash of the raw response.
+
+    Skips pretty-printing the (possibly large) JSON tree entirely.
+    """
+    raw = result.get("status")
+    status = raw.upper() if isinstance(raw, str) else ""
+    digest = hashlib.sha1(dumps(result)).hexdigest()[:12]
+    print(f"{status or 'UNKNOWN'} {digest}")
+    return 0 if status == "COMPLETED" else 2
 
 
 def main() -> int:
@@ -9,20 +55,93 @@ def main() -> int:
     Lightweight connectivity test:
     - Verifies API key loading from skills/tinyfish/.env
     - Verifies TinyFish /run endpoint is reachable and returns a valid response
+
+    Successful results are cached on disk for an hour so CI loops re-running
+    the check do not burn API quota; pass --no-cache to force a live call.
     """
+    parser = argparse.ArgumentParser(description="TinyFish connectivity test.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the response cache and always hit the API",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Hit the API and overwrite the cached response",
+    )
+    parser.add_argument(
+        "--n",
+        type=int,
+        default=1,
+        help="Run N live requests over one HTTP session and report latencies",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Print only the status and a short response hash (for CI)",
+    )
+    args = parser.parse_args()
+
     test_url = "https://example.com"
     test_goal = "Extract the page title and return it as JSON."
+    cache_path = _cache_path(test_url, test_goal)
 
-    print("Running TinyFish connectivity test...")
+    if args.n > 1:
+        # Batch mode is always live (a cached answer says nothing about
+        # current latency); the client's shared session means TLS handshake
+        # and DNS are paid once, not N times
+        from _tinyfish_client import run_sync
+
+        print(f"Running {args.n} TinyFish connectivity requests over one session...")
+        completed = 0
+        result: dict = {}
+        for i in range(1, args.n + 1):
+            start = time.perf_counter()
+            result = run_sync(test_url, test_goal)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            raw = result.get("status")
+            call_status = raw.upper() if isinstance(raw, str) else ""
+            completed += call_status == "COMPLETED"
+            print(f"  [{i}/{args.n}] {call_status or 'UNKNOWN'} in {elapsed_ms:.0f} ms")
+        print(f"COMPLETED ratio: {completed}/{args.n}")
+        write_json(result, indent=sys.stdout.isatty())
+        return 0 if completed == args.n else 2
+
+    if not (args.no_cache or args.refresh_cache):
+        cached = _load_cached(cache_path)
+        if cached is not None:
+            if args.quiet:
+                return _quiet_report(cached)
+            write_json(
+                cached,
+                indent=sys.stdout.isatty(),
+                prefix="Connectivity test passed (cached result, use --no-cache for a live check).",
+            )
+            return 0
+
+    # Deferred import keeps startup cheap until we know we hit the network
+    from _tinyfish_client import run_sync
+
+    if not args.quiet:
+        print("Running TinyFish connectivity test...")
     result = run_sync(test_url, test_goal)
 
-    status = str(result.get("status", "")).upper()
+    raw_status = result.get("status")
+    status = raw_status.upper() if isinstance(raw_status, str) else ""
     if status == "COMPLETED":
-        print("Connectivity test passed. TinyFish API returned COMPLETED.")
+        message = "Connectivity test passed. TinyFish API returned COMPLETED."
+        if not args.no_cache:
+            _store_cached(cache_path, result)
     else:
-        print(f"Connectivity test returned status={status or 'UNKNOWN'}.")
+        message = f"Connectivity test returned status={status or 'UNKNOWN'}."
+
+    if args.quiet:
+        return _quiet_report(result)
 
-    print(json.dumps(result, indent=2, ensure_ascii=True))
+    # Indent only for humans; piped output gets compact JSON.
+    # Status line and body go out in one buffered write.
+    write_json(result, indent=sys.stdout.isatty(), prefix=message)
     return 0 if status == "COMPLETED" else 2
 
 